@@ -0,0 +1,78 @@
+# Cleaning engine for the exported DataFrame.
+#
+# df_cleaner works column by column on the unique values only (the archive repeats the same
+# type, date and party strings many times), using pandas .str operations and translation tables
+# shared by the whole process. Its output is identical to applying the scalar helpers below row by row.
+
+import pandas as pd
+import unicodedata
+import re
+
+
+def remove_punctuation(text):
+    if text == 'N/A':
+        return text
+    return ''.join(char for char in text if not (unicodedata.category(char).startswith('P') and char != '|'))
+
+
+def replace_with_na(text: str) -> str:
+    return re.sub(pattern=r'^[\s_-]+$', repl='N/A', string=text)  # Replace _, __, -, --, --- with N/A
+
+
+# Function to remove Extra Spaces from Text
+def remove_extra_spaces(_text: str) -> str:
+    return ' '.join(_text.split())  # Remove extra spaces
+
+
+def remove_diacritics(input_str):
+    return ''.join(char for char in unicodedata.normalize('NFD', input_str) if not unicodedata.combining(char))
+
+
+class TranslationTable(dict):
+    """str.translate table that deletes every character matching ``predicate``, filled in the first time a character is seen."""
+
+    def __init__(self, predicate):
+        super().__init__()
+        self.predicate = predicate
+
+    def __missing__(self, code_point: int):
+        self[code_point] = None if self.predicate(chr(code_point)) else code_point
+        return self[code_point]
+
+
+# Unicode punctuation (category P*) except the '|' separator, and combining characters (applied after NFD normalization)
+PUNCTUATION_TABLE = TranslationTable(predicate=lambda char: unicodedata.category(char).startswith('P') and char != '|')
+COMBINING_TABLE = TranslationTable(predicate=unicodedata.combining)
+
+
+# Free-text columns: the Coveo title, alias and parties, and the parties/aliases read from the PDFs (PdfTextPipeline)
+PUNCTUATION_COLUMNS = ['title', 'alias', 'parties_involved', 'pdf_parties', 'pdf_aliases']
+
+
+def clean_column(column: pd.Series, strip_punctuation: bool) -> pd.Series:
+    codes, uniques = pd.factorize(column)  # Clean each distinct value once
+    cleaned = pd.Series(uniques, dtype=object)
+    if strip_punctuation:
+        cleaned = cleaned.str.replace('–', '', regex=False)
+        cleaned = cleaned.where(cleaned == 'N/A', cleaned.str.translate(PUNCTUATION_TABLE))  # 'N/A' keeps its slash
+    cleaned = cleaned.str.split().str.join(' ')  # Remove extra spaces
+    non_ascii = ~cleaned.str.isascii()  # ASCII text has no diacritics, NFD leaves it unchanged
+    cleaned[non_ascii] = cleaned[non_ascii].str.normalize('NFD').str.translate(COMBINING_TABLE)  # Remove diacritics characters
+    # Blank and 'NA' values become "N/A", missing values too (codes of -1)
+    cleaned = cleaned.mask(cleaned.isin(['', 'NA']) | cleaned.str.isspace(), 'N/A')
+    values = pd.api.extensions.take(cleaned.to_numpy(), codes, allow_fill=True, fill_value='N/A')
+    return pd.Series(values, index=column.index, name=column.name, dtype=column.dtype)
+
+
+def df_cleaner(data_frame) -> pd.DataFrame:
+    columns = data_frame.columns.sort_values()
+    data_frame = data_frame.astype(str)  # Convert all data to string
+    data_frame.drop_duplicates(inplace=True)  # Remove duplicate data from DataFrame
+    # Apply the cleaning to all columns
+    for column in columns:
+        # Remove punctuation only from the free-text columns
+        strip_punctuation = column in PUNCTUATION_COLUMNS
+        data_frame[column] = clean_column(data_frame[column], strip_punctuation=strip_punctuation)
+    priority_columns = ["url", "title", "date", "type", "pdf_url"]
+    columns_required = priority_columns + [col for col in columns if col not in priority_columns]
+    return data_frame[columns_required]
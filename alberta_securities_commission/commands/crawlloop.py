@@ -0,0 +1,36 @@
+# `scrapy crawlloop`: the long-lived runner (runner.py) as a project command (COMMANDS_MODULE in settings.py).
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+from scrapy.utils.conf import arglist_to_dict
+from alberta_securities_commission.runner import long_lived_settings, run_crawl_loop
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return '[options] <spider> [<spider> ...]'
+
+    def short_desc(self):
+        return 'Run crawls repeatedly in one long-lived process'
+
+    def add_options(self, parser):
+        super().add_options(parser)
+        parser.add_argument('-a', dest='spargs', action='append', default=[], metavar='NAME=VALUE', help='set spider argument (may be repeated)')
+        parser.add_argument('--every', type=float, default=0, help='seconds between the starts of two rounds')
+        parser.add_argument('--times', type=int, default=1, help='number of rounds (0: run until stopped)')
+
+    def process_options(self, args, opts):
+        super().process_options(args, opts)
+        try:
+            opts.spargs = arglist_to_dict(opts.spargs)
+        except ValueError:
+            raise UsageError('Invalid -a value, use -a NAME=VALUE', print_help=False)
+        long_lived_settings(self.settings)  # Before the crawler process is created from these settings
+
+    def run(self, args, opts):
+        if not args:
+            raise UsageError()
+        if run_crawl_loop(self.crawler_process, spider_names=args, spider_kwargs=opts.spargs, every=opts.every, times=opts.times):
+            self.exitcode = 1
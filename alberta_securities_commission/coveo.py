@@ -0,0 +1,55 @@
+# Helpers for the Coveo search requests sent by the spider.
+#
+# The search is a form-encoded POST whose body carries client bookkeeping (query history,
+# analytics ids) next to the actual query, so two requests for the same page rarely have
+# byte-identical bodies. normalize_search_body keeps only what decides the response.
+
+from urllib.parse import parse_qsl, quote, urlencode
+from datetime import date
+import hashlib
+
+SEARCH_PATH = '/coveo/rest/search'
+
+# Fields that change between sessions without changing the results
+VOLATILE_FIELDS = ['actionsHistory', 'analytics', 'visitorId', 'referrer', 'isGuestUser', 'timezone']
+
+
+def is_search_request(request) -> bool:
+    return request.method == 'POST' and SEARCH_PATH in request.url
+
+
+def normalize_search_body(body, volatile_fields: list = None) -> str:
+    body = body.decode('utf-8') if isinstance(body, bytes) else body
+    volatile_fields = VOLATILE_FIELDS if volatile_fields is None else volatile_fields
+    search_params = [(key, value) for key, value in parse_qsl(body, keep_blank_values=True) if key not in volatile_fields]
+    return urlencode(sorted(search_params), quote_via=quote)  # Parameter order does not matter either
+
+
+def search_key(request, volatile_fields: list = None) -> str:
+    # Stable key for a search request: URL plus normalized body
+    normalized_body = normalize_search_body(request.body, volatile_fields=volatile_fields)
+    return hashlib.sha1(f'{request.url}\n{normalized_body}'.encode('utf-8')).hexdigest()
+
+
+# Date partitions: half-open [start, end) ranges on @z95xcreateddate, the field the archive is sorted on
+def date_range_filter(start: date, end: date) -> str:
+    return f'@z95xcreateddate>={start:%Y/%m/%d} @z95xcreateddate<{end:%Y/%m/%d}'
+
+
+def year_partitions(year: int, by_month: bool) -> list:
+    if not by_month:
+        return [(date(year, 1, 1), date(year + 1, 1, 1))]
+    return [(date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)) for month in range(1, 13)]
+
+
+def split_date_range(start: date, end: date) -> list:
+    middle = start + (end - start) / 2
+    return [(start, middle), (middle, end)]
+
+
+def facet_values(response_dict: dict, field: str) -> dict:
+    # {value: numberOfResults} of a groupBy facet ('@' prefix optional)
+    for group in response_dict.get('groupByResults', []):
+        if group.get('field', '').lstrip('@') == field.lstrip('@'):
+            return {value['value']: value.get('numberOfResults', 0) for value in group.get('values', [])}
+    return {}
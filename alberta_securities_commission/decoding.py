@@ -0,0 +1,102 @@
+# Decoding of the Coveo search responses straight from the response bytes.
+#
+# Only the fields the spider uses are materialized, into compact __slots__ records. With msgspec the
+# typed schema below skips everything else (excerpts, highlights, groupBy, ...) while parsing; orjson
+# and the stdlib build the whole dict first and are used when msgspec is absent or a page does not
+# fit the schema.
+
+from typing import List, Optional, Union
+import json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DECODER_BACKENDS = ['msgspec', 'orjson', 'json']
+
+
+class CoveoResult:
+    """The fields of one search result used by the extractors (missing fields get the extractors' defaults)."""
+
+    __slots__ = ('click_uri', 'sysdate', 'titles', 'parties_involved', 'notices_types')
+
+    def __init__(self, click_uri='N/A', sysdate=None, titles=None, parties_involved=None, notices_types=None):
+        self.click_uri = click_uri  # clickUri
+        self.sysdate = sysdate  # raw.sysdate, milliseconds since the epoch
+        self.titles = ['N/A'] if titles is None else titles  # raw.z95xsitecoretitle
+        self.parties_involved = ['N/A'] if parties_involved is None else parties_involved  # raw.z95xpartiesinvolved
+        self.notices_types = ['N/A'] if notices_types is None else notices_types  # raw.z95xnoticesdecisionstype
+
+    @classmethod
+    def from_dict(cls, result_dict: dict):
+        raw: dict = result_dict.get('raw', {})
+        return cls(click_uri=result_dict.get('clickUri', 'N/A'), sysdate=raw.get('sysdate'), titles=raw.get('z95xsitecoretitle', ['N/A']),
+                   parties_involved=raw.get('z95xpartiesinvolved', ['N/A']), notices_types=raw.get('z95xnoticesdecisionstype', ['N/A']))
+
+
+class CoveoPage:
+    __slots__ = ('total_count', 'results')
+
+    def __init__(self, total_count: int, results: list):
+        self.total_count = total_count  # totalCountFiltered
+        self.results = results  # CoveoResult records
+
+
+if msgspec is not None:
+    class _RawStruct(msgspec.Struct):
+        sysdate: Union[int, float, None] = None
+        z95xsitecoretitle: List[str] = msgspec.field(default_factory=lambda: ['N/A'])
+        z95xpartiesinvolved: List[str] = msgspec.field(default_factory=lambda: ['N/A'])
+        z95xnoticesdecisionstype: List[str] = msgspec.field(default_factory=lambda: ['N/A'])
+
+    class _ResultStruct(msgspec.Struct):
+        clickUri: Optional[str] = 'N/A'
+        raw: _RawStruct = msgspec.field(default_factory=_RawStruct)
+
+    class _PageStruct(msgspec.Struct):
+        totalCountFiltered: int = 0
+        results: List[_ResultStruct] = []
+
+
+class PageDecoder:
+    """Decodes Coveo search response bodies with the fastest available backend (ASC_JSON_DECODER: 'auto', 'msgspec', 'orjson' or 'json')."""
+
+    def __init__(self, backend: str = 'auto'):
+        available = [name for name, module in zip(DECODER_BACKENDS, [msgspec, orjson, json]) if module is not None]
+        if backend == 'auto':
+            backend = available[0]
+        elif backend not in DECODER_BACKENDS:
+            raise ValueError(f'Unsupported ASC_JSON_DECODER: {backend!r}')
+        elif backend not in available:
+            raise ImportError(f'ASC_JSON_DECODER = {backend!r} needs the {backend} package')
+        self.backend = backend
+        self.page_decoder = msgspec.json.Decoder(_PageStruct) if backend == 'msgspec' else None
+        self.schema_fallbacks = 0  # Pages that did not fit the typed schema and went through decode_dict
+
+    def decode_dict(self, body: bytes) -> dict:
+        # The whole response, for the rare requests that need more than the results (facets)
+        if self.backend == 'msgspec':
+            return msgspec.json.decode(body)
+        if self.backend == 'orjson':
+            return orjson.loads(body)
+        return json.loads(body)
+
+    def decode_page(self, body: bytes) -> CoveoPage:
+        if self.page_decoder is not None:
+            try:
+                page = self.page_decoder.decode(body)
+            except msgspec.ValidationError:
+                self.schema_fallbacks += 1  # Unexpected field types, the dict path handles them like before
+            else:
+                return CoveoPage(total_count=page.totalCountFiltered, results=[
+                    CoveoResult(click_uri=result.clickUri, sysdate=result.raw.sysdate, titles=result.raw.z95xsitecoretitle,
+                                parties_involved=result.raw.z95xpartiesinvolved, notices_types=result.raw.z95xnoticesdecisionstype)
+                    for result in page.results])
+        response_dict = self.decode_dict(body)
+        return CoveoPage(total_count=response_dict.get('totalCountFiltered', 0), results=[CoveoResult.from_dict(result_dict) for result_dict in response_dict.get('results', [])])
@@ -0,0 +1,66 @@
+# Egress backends for the crawl: how requests reach asc.ca (ExpressVPN, an HTTP proxy, or directly).
+#
+# EgressMiddleware (middlewares.py) brings the backend up when the spider opens, without blocking
+# the reactor, and holds requests back only until is_ready() is true. Select one with ASC_EGRESS_BACKEND.
+
+
+class NoopEgress:
+    """Direct connection, for environments that can already reach asc.ca."""
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls()
+
+    def connect(self):
+        pass
+
+    def is_ready(self) -> bool:
+        return True
+
+    def process_request(self, request):
+        pass
+
+    def disconnect(self):
+        pass
+
+
+class ExpressVpnEgress(NoopEgress):
+    """ExpressVPN tunnel through evpn (ASC_VPN_COUNTRY_ID, default '181' = Canada)."""
+
+    def __init__(self, country_id: str):
+        import evpn  # Only needed when this backend is selected
+        self.country_id = country_id
+        self.api = evpn.ExpressVpnApi()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(country_id=crawler.settings.get('ASC_VPN_COUNTRY_ID', '181'))
+
+    def connect(self):
+        print(f'Connecting to VPN (country {self.country_id})')
+        self.api.connect(country_id=self.country_id)
+
+    def is_ready(self) -> bool:
+        return self.api.is_connected
+
+    def disconnect(self):
+        if self.api.is_connected:  # Disconnecting VPN if it's still connected
+            self.api.disconnect()
+            print('VPN Connected!' if self.api.is_connected else 'VPN Disconnected!')
+
+
+class ProxyEgress(NoopEgress):
+    """Routes every request through the proxy in ASC_EGRESS_PROXY (e.g. a local VPN gateway)."""
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        proxy = crawler.settings.get('ASC_EGRESS_PROXY')
+        if not proxy:
+            raise ValueError('ProxyEgress requires ASC_EGRESS_PROXY')
+        return cls(proxy=proxy)
+
+    def process_request(self, request):
+        request.meta.setdefault('proxy', self.proxy)
@@ -0,0 +1,33 @@
+# Final export of the cleaned DataFrame (ASC_EXPORT_FORMATS).
+#
+# Columnar formats (parquet, arrow) are typed: 'date' is a real date column and the "N/A"
+# placeholders become nulls. csv.gz and xlsx keep the cleaned strings exactly as before.
+
+import pandas as pd
+
+EXPORT_FORMATS = ['parquet', 'arrow', 'csv.gz', 'xlsx']
+
+
+def typed_frame(data_frame: pd.DataFrame) -> pd.DataFrame:
+    data_frame = data_frame.replace('N/A', None).astype('string')  # Missing values become real nulls
+    if 'id' in data_frame:
+        data_frame['id'] = data_frame['id'].astype('int64')
+    data_frame['date'] = pd.to_datetime(data_frame['date'], format='%Y-%m-%d', errors='coerce').dt.date  # Stored as date32
+    return data_frame
+
+
+def export_frame(data_frame: pd.DataFrame, base_path: str, export_format: str) -> str:
+    # Writes data_frame to '<base_path>.<export_format>' and returns that path
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported export format: {export_format!r} (expected one of {EXPORT_FORMATS})')
+    path = f'{base_path}.{export_format}'
+    if export_format == 'parquet':
+        typed_frame(data_frame).to_parquet(path, index=False, compression='zstd')
+    elif export_format == 'arrow':
+        typed_frame(data_frame).to_feather(path, compression='zstd')  # Feather v2 is the Arrow IPC file format
+    elif export_format == 'csv.gz':
+        data_frame.to_csv(path, index=False, compression='gzip')
+    else:
+        with pd.ExcelWriter(path=path, engine='xlsxwriter') as writer:
+            data_frame.to_excel(excel_writer=writer, index=False)
+    return path
@@ -0,0 +1,166 @@
+# Define here your extensions
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/extensions.html
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from alberta_securities_commission.coveo import is_search_request
+import cProfile
+import json
+import time
+import sys
+import os
+import re
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+REPORT_FORMATS = ['json', 'prometheus']
+PROFILERS = ['cprofile', 'pyinstrument']
+
+
+@contextmanager
+def stage_timer(stats, stage: str):
+    # Adds the block's wall time to the 'timing/<stage>_seconds' stat (no-op without a stats collector, e.g. in the benchmarks)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.inc_value(f'timing/{stage}_seconds', time.perf_counter() - start)
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024  # Bytes on macOS, KiB elsewhere
+
+
+def stage_seconds(stats: dict) -> dict:
+    # {'json_decode': 1.2, ...} from the 'timing/<stage>_seconds' stats, plus the egress readiness wait
+    stages = {key[len('timing/'):-len('_seconds')]: value for key, value in stats.items() if key.startswith('timing/') and key.endswith('_seconds')}
+    if 'egress/ready_seconds' in stats:
+        stages['egress_ready'] = stats['egress/ready_seconds']
+    return stages
+
+
+def prometheus_lines(report: dict) -> list:
+    # Textfile collector format: numeric stats as gauges named asc_<stat>, stage timings labelled by stage
+    lines = ['# TYPE asc_stage_seconds gauge']
+    lines += [f'asc_stage_seconds{{spider="{report["spider"]}",stage="{stage}"}} {seconds}' for stage, seconds in sorted(report['stages'].items())]
+    for key, value in sorted(report['stats'].items()):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = 'asc_' + re.sub(r'[^a-zA-Z0-9_]', '_', key).strip('_')
+        lines += [f'# TYPE {name} gauge', f'{name}{{spider="{report["spider"]}"}} {value}']
+    return lines
+
+
+class RunReportExtension:
+    """Counts the Coveo pages and their bytes, times the network, and writes a run report when the crawl ends.
+
+    The spider and the pipelines add their own stage timings ('timing/<stage>_seconds', see stage_timer).
+    The report (ASC_REPORT_FORMAT: 'json' or 'prometheus' textfile) holds the stage timings, the peak
+    memory and every numeric stat. ASC_PROFILE = 'cprofile' or 'pyinstrument' also profiles the whole
+    crawl into ASC_PROFILE_PATH.
+    """
+
+    def __init__(self, stats, report_format: str, report_path: str, profiler_name: str, profile_path: str):
+        self.stats = stats
+        self.report_format = report_format
+        self.report_path = report_path
+        self.profiler_name = profiler_name
+        self.profile_path = profile_path
+        self.profiler = None
+        self.started = None
+        self.closed = None  # (spider, reason) once the spider has closed
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ASC_REPORT_ENABLED', True):
+            raise NotConfigured
+        report_format = crawler.settings.get('ASC_REPORT_FORMAT', 'json')
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f'Unsupported ASC_REPORT_FORMAT: {report_format!r}')
+        profiler_name = crawler.settings.get('ASC_PROFILE')
+        if profiler_name not in [None, *PROFILERS]:
+            raise ValueError(f'Unsupported ASC_PROFILE: {profiler_name!r}')
+        s = cls(stats=crawler.stats, report_format=report_format, report_path=crawler.settings.get('ASC_REPORT_PATH'),
+                profiler_name=profiler_name, profile_path=crawler.settings.get('ASC_PROFILE_PATH'))
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.response_received, signal=signals.response_received)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(s.engine_stopped, signal=signals.engine_stopped)
+        return s
+
+    def spider_opened(self, spider):
+        self.started = time.monotonic()
+        self.report_path = self.report_path or fr"{spider.excel_path}/{spider.name}_report.{'json' if self.report_format == 'json' else 'prom'}"
+        if self.profiler_name == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                spider.logger.warning('ASC_PROFILE = pyinstrument needs the pyinstrument package, profiling is disabled')
+                return
+            self.profiler = Profiler(async_mode='disabled')  # The reactor runs everything, time is attributed to its call stacks
+            self.profiler.start()
+        elif self.profiler_name == 'cprofile':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def response_received(self, response, request, spider):
+        if request.meta.get('download_latency') is not None:
+            self.stats.inc_value('timing/download_seconds', request.meta['download_latency'])
+        if is_search_request(request):
+            self.stats.inc_value('pages/search_count')
+            self.stats.inc_value('pages/search_bytes', len(response.body))
+
+    def spider_closed(self, spider, reason):
+        self.closed = (spider, reason)  # Reported once the engine has stopped, after the exports run by the pipeline's spider_closed
+
+    def engine_stopped(self):
+        if self.closed is None:  # The spider never opened
+            return
+        spider, reason = self.closed
+        self.stop_profiler(spider)
+        elapsed_seconds = time.monotonic() - self.started
+        if peak_rss_bytes() is not None:
+            self.stats.max_value('memory/peak_rss_bytes', peak_rss_bytes())
+        stats = self.stats.get_stats()
+        report = {
+            'spider': spider.name,
+            'reason': reason,
+            'finished': datetime.now(timezone.utc).isoformat(),
+            'elapsed_seconds': elapsed_seconds,
+            'items_per_second': stats.get('item_scraped_count', 0) / elapsed_seconds if elapsed_seconds else 0,
+            'stages': stage_seconds(stats),
+            'stats': {key: value.isoformat() if isinstance(value, datetime) else value for key, value in stats.items()},
+        }
+        temporary_path = f'{self.report_path}.tmp'  # Renamed when complete, textfile collectors never read a partial file
+        with open(temporary_path, mode='w', encoding='utf-8') as report_file:
+            if self.report_format == 'json':
+                json.dump(report, report_file, indent=2, default=str)
+            else:
+                report_file.write('\n'.join(prometheus_lines(report)) + '\n')
+        os.replace(temporary_path, self.report_path)
+        print(f'Run report written to {self.report_path}')
+
+    def stop_profiler(self, spider):
+        if self.profiler is None:
+            return
+        if self.profiler_name == 'pyinstrument':
+            self.profiler.stop()
+            profile_path = self.profile_path or fr"{spider.excel_path}/{spider.name}_profile.html"
+            with open(profile_path, mode='w', encoding='utf-8') as profile_file:
+                profile_file.write(self.profiler.output_html())
+        else:
+            self.profiler.disable()
+            profile_path = self.profile_path or fr"{spider.excel_path}/{spider.name}.prof"
+            self.profiler.dump_stats(profile_path)  # python -m pstats / snakeviz
+        print(f'Profile written to {profile_path}')
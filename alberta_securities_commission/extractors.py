@@ -0,0 +1,87 @@
+# Extraction helpers turning one Coveo search result (decoding.CoveoResult) into item fields.
+
+from alberta_securities_commission.decoding import CoveoResult
+from datetime import datetime
+import re
+
+
+def get_pdf_url(result: CoveoResult) -> str:
+    click_uri: str = result.click_uri  # Extract the clickUri
+    pdf_base_url: str = 'https://www.asc.ca'  # Convert the clickUri to the desired format
+    pdf_url: str = click_uri.replace('https://asc-cws-prod-web-cm-staging.azurewebsites.net', pdf_base_url)  # Replace the base URL with the desired base URL
+    return pdf_url if click_uri not in ['', ' ', None] else 'N/A'
+
+
+ALIAS_KEYWORDS = ['formerly known as', 'carrying on business as', 'previously known as', 'now known as',
+                  'also known as', 'operating as', 'formerly', 'known as', 'a.k.a.', 'aka', 'dba', 'Inc', 'Ltd', 'Inc.', 'Ltd.', '.,', ';']
+
+
+class TitleAliasParser:
+    """Splits titles on alias keywords ('formerly known as', 'aka', 'Inc', ...) with one regex compiled once."""
+
+    def __init__(self, alias_keywords: list = None):
+        alias_keywords = ALIAS_KEYWORDS if alias_keywords is None else alias_keywords
+        # A keyword containing an earlier one can never match once the earlier one is split out ('Inc.' after 'Inc')
+        self.alias_keywords: list = []
+        for alias_keyword in alias_keywords:
+            if not any(kept_keyword in alias_keyword for kept_keyword in self.alias_keywords):
+                self.alias_keywords.append(alias_keyword)
+        # Longest keyword first, so the leftmost match is always the longest one ('formerly known as' over 'formerly')
+        self.pattern = re.compile('|'.join(re.escape(alias_keyword) for alias_keyword in sorted(self.alias_keywords, key=len, reverse=True)))
+
+    def split(self, title: str) -> list:
+        return self.pattern.sub(' | ', title).split('|')  # Single pass over the title
+
+    def parse_title(self, title: str) -> tuple:
+        splitted_title = self.split(title)
+        _title_value = splitted_title[0].strip() if len(splitted_title) > 1 else ' '.join(splitted_title).strip()
+        _alias_value = ' '.join(splitted_title[1:]).strip('.').strip() if len(splitted_title) > 1 else 'N/A'
+        title_value = _title_value if _title_value not in ['', None, ' .', ' ', '.'] else 'N/A'
+        alias_value = _alias_value if _alias_value not in ['', None, ' .', ' ', '.'] else 'N/A'
+        if alias_value != 'N/A':
+            alias_value = alias_value.strip('.').strip()
+        return title_value, alias_value
+
+    def parse(self, titles_list: list) -> tuple:
+        title_value_list, alias_value_list = [], []
+        for title in titles_list:
+            title = title.replace("\n", "").replace("<br>", "")  # Remove newline character '\n' and remove '<br>'
+            title_value, alias_value = self.parse_title(title)
+            if title_value not in ['N/A', '']:
+                title_value_list.append(title_value)
+            if alias_value not in ['N/A', '']:
+                alias_value_list.append(alias_value)
+        title_value_str = ' | '.join(title_value_list).strip() if title_value_list != [] else 'N/A'
+        alias_value_str = ' | '.join(alias_value_list).strip() if alias_value_list != [] else 'N/A'
+        return title_value_str, alias_value_str
+
+
+title_alias_parser = TitleAliasParser()
+
+
+def get_title_alias(result: CoveoResult) -> tuple:
+    titles_list: list = result.titles
+    return title_alias_parser.parse(titles_list)
+
+
+def get_parties_involved(result: CoveoResult) -> str:
+    parties_involved: str = ' | '.join(result.parties_involved).strip()
+    parties_involved = parties_involved if parties_involved not in ['', None] else 'N/A'
+    return parties_involved
+
+
+def get_date(result: CoveoResult) -> str:
+    # Assuming sysdate is in milliseconds (as it seems to be a UNIX timestamp in ms)
+    sysdate = result.sysdate
+    date = 'N/A'
+    if sysdate not in ['', ' ', None, []]:
+        sysdate_seconds = sysdate / 1000  # Convert milliseconds to seconds (Python's datetime works with seconds)
+        item_date = datetime.fromtimestamp(sysdate_seconds)  # Convert the timestamp to a datetime object
+        date = item_date.strftime("%Y-%m-%d")  # Format the date to "YYYY-MM-DD" similar to the JavaScript output
+    return date
+
+
+def get_notices_type(result: CoveoResult) -> str:
+    notices_type_list: str = ' | '.join(result.notices_types).strip()
+    notices_type = notices_type_list if notices_type_list not in ['', None] else 'N/A'
+    return notices_type
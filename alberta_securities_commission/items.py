@@ -7,6 +7,15 @@ import scrapy
 
 
 class AlbertaSecuritiesCommissionItem(scrapy.Item):
-    # define the fields for your item here like:
-    # name = scrapy.Field()
-    pass
+    url = scrapy.Field()  # On-site listing page the document was found on
+    pdf_url = scrapy.Field()
+    date = scrapy.Field()  # YYYY-MM-DD, derived from sysdate
+    title = scrapy.Field()
+    alias = scrapy.Field()
+    type = scrapy.Field()  # Notices / decisions type
+    parties_involved = scrapy.Field()
+    pdf_sha256 = scrapy.Field()  # Set by PdfDownloadPipeline (ASC_PDF_DOWNLOAD)
+    pdf_path = scrapy.Field()  # Content-addressed path of the downloaded PDF
+    pdf_text = scrapy.Field()  # Set by PdfTextPipeline (ASC_PDF_TEXT)
+    pdf_parties = scrapy.Field()  # Parties named in the decision's heading
+    pdf_aliases = scrapy.Field()
@@ -4,9 +4,27 @@
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
 from scrapy import signals
+from scrapy.downloadermiddlewares.retry import get_retry_request
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import TextResponse
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.defer import deferred_from_coro, maybe_deferred_to_future
+from scrapy.utils.misc import load_object
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+from twisted.internet.task import deferLater
+from twisted.internet.threads import deferToThread
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
+from alberta_securities_commission.coveo import VOLATILE_FIELDS, is_search_request, search_key
+from alberta_securities_commission.shared import header_generator, shared_egress_backend
+from collections import OrderedDict
+import random
+import json
+import re
+import time
+import os
 
 
 class AlbertaSecuritiesCommissionSpiderMiddleware:
@@ -101,3 +119,312 @@ class AlbertaSecuritiesCommissionDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class CoveoReplayMiddleware:
+    """Records raw Coveo search responses to disk, or replays them without touching the network.
+
+    ASC_REPLAY_MODE = 'record' saves every successful search response under ASC_REPLAY_DIR,
+    ASC_REPLAY_MODE = 'replay' answers search requests from those files (a missing fixture is an error).
+    """
+
+    def __init__(self, mode: str, fixtures_dir: str):
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        mode = crawler.settings.get('ASC_REPLAY_MODE')
+        if mode not in ['record', 'replay']:
+            raise NotConfigured
+        s = cls(mode=mode, fixtures_dir=crawler.settings.get('ASC_REPLAY_DIR', 'fixtures/coveo'))
+        os.makedirs(s.fixtures_dir, exist_ok=True)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        return s
+
+    def fixture_path(self, request) -> str:
+        return os.path.join(self.fixtures_dir, f'{search_key(request)}.json')
+
+    def process_request(self, request, spider):
+        if self.mode != 'replay' or not is_search_request(request):
+            return None
+        path = self.fixture_path(request)
+        if not os.path.exists(path):
+            spider.logger.error(f'No recorded Coveo response for {request.url} ({path})')
+            raise IgnoreRequest(f'Missing fixture {path}')
+        with open(path, mode='rb') as fixture_file:
+            body = fixture_file.read()
+        return TextResponse(url=request.url, status=200, headers={'Content-Type': 'application/json; charset=utf-8'}, body=body, encoding='utf-8', request=request)
+
+    def process_response(self, request, response, spider):
+        if self.mode == 'record' and response.status == 200 and is_search_request(request):
+            with open(self.fixture_path(request), mode='wb') as fixture_file:
+                fixture_file.write(response.body)
+        return response
+
+    def spider_opened(self, spider):
+        spider.logger.info(f'Coveo fixtures: {self.mode} ({self.fixtures_dir})')
+
+
+class EgressMiddleware:
+    """Brings the egress backend (ASC_EGRESS_BACKEND) up in the background and lets requests go as soon as it is ready.
+
+    The backend's blocking calls run in a thread and readiness is polled every ASC_EGRESS_POLL_INTERVAL
+    seconds, so the reactor keeps running. If the backend is not ready after ASC_EGRESS_READY_TIMEOUT
+    seconds the spider is closed with reason 'egress_unavailable'. With ASC_EGRESS_KEEP_ALIVE (long-lived
+    runners) the backend is shared by the process's crawls and stays connected when a spider closes.
+    """
+
+    def __init__(self, crawler, backend, ready_timeout: float, poll_interval: float, keep_alive: bool):
+        self.crawler = crawler
+        self.backend = backend
+        self.keep_alive = keep_alive
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.ready = None  # Deferred fired with True/False once the backend is up (or gave up)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if crawler.settings.get('ASC_REPLAY_MODE') == 'replay':  # Replayed fixtures need no network access
+            raise NotConfigured
+        keep_alive = crawler.settings.getbool('ASC_EGRESS_KEEP_ALIVE')
+        if keep_alive:
+            backend = shared_egress_backend(crawler)
+        else:
+            backend = load_object(crawler.settings.get('ASC_EGRESS_BACKEND', 'alberta_securities_commission.egress.NoopEgress')).from_crawler(crawler)
+        s = cls(crawler=crawler, backend=backend, ready_timeout=crawler.settings.getfloat('ASC_EGRESS_READY_TIMEOUT', 60),
+                poll_interval=crawler.settings.getfloat('ASC_EGRESS_POLL_INTERVAL', 0.5), keep_alive=keep_alive)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    async def bring_up(self, spider) -> bool:
+        start = time.monotonic()
+        try:
+            if not await maybe_deferred_to_future(deferToThread(self.backend.is_ready)):  # Still up from an earlier crawl otherwise
+                await maybe_deferred_to_future(deferToThread(self.backend.connect))
+            while not await maybe_deferred_to_future(deferToThread(self.backend.is_ready)):
+                if time.monotonic() - start > self.ready_timeout:
+                    raise TimeoutError(f'not ready after {self.ready_timeout} s')
+                await maybe_deferred_to_future(deferLater(reactor, self.poll_interval, lambda: None))
+        except Exception as e:
+            spider.logger.error(f'{type(self.backend).__name__} failed: {e}')
+            self.crawler.engine.close_spider(spider, 'egress_unavailable')
+            return False
+        ready_seconds = time.monotonic() - start
+        self.crawler.stats.set_value('egress/ready_seconds', ready_seconds)
+        spider.logger.info(f'{type(self.backend).__name__} ready after {ready_seconds:.1f} s')
+        return True
+
+    async def process_request(self, request, spider):
+        if not await maybe_deferred_to_future(self.wait_ready()):
+            raise IgnoreRequest('Egress backend is not available')
+        self.backend.process_request(request)
+        return None
+
+    def wait_ready(self):
+        # Every waiting request gets its own Deferred chained on the shared one
+        waiter = Deferred()
+        self.ready.addBoth(lambda result: (waiter.callback(result), result)[1])
+        return waiter
+
+    def spider_opened(self, spider):
+        self.ready = deferred_from_coro(self.bring_up(spider))
+
+    def spider_closed(self, spider):
+        if not self.keep_alive:  # Shared backends are disconnected when the runner stops
+            return deferToThread(self.backend.disconnect)
+
+
+class CoveoCacheMiddleware:
+    """On-disk cache for the Coveo search POSTs (ASC_CACHE_ENABLED), keyed on the URL and the normalized body.
+
+    The volatile body fields (ASC_CACHE_IGNORE_FIELDS: query history, analytics ids, ...) are left out of
+    the key, so reruns hit the cache although the spider's session data differs. Entries expire after
+    ASC_CACHE_TTL seconds (0: never) and the least recently used ones are evicted above ASC_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, stats, cache_dir: str, ttl: float, max_bytes: int, ignore_fields: list):
+        self.stats = stats
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.ignore_fields = ignore_fields
+        self.entries = OrderedDict()  # key -> body size, least recently used first
+        self.total_bytes = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ASC_CACHE_ENABLED'):
+            raise NotConfigured
+        s = cls(stats=crawler.stats, cache_dir=crawler.settings.get('ASC_CACHE_DIR', 'httpcache/coveo'), ttl=crawler.settings.getfloat('ASC_CACHE_TTL', 0),
+                max_bytes=crawler.settings.getint('ASC_CACHE_MAX_BYTES', 500 * 2 ** 20), ignore_fields=crawler.settings.getlist('ASC_CACHE_IGNORE_FIELDS', VOLATILE_FIELDS))
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        return s
+
+    def entry_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.{extension}')
+
+    def spider_opened(self, spider):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Rebuild the LRU order from the body files' modification times (touched on every hit)
+        bodies = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.body')]
+        for entry in sorted(bodies, key=lambda entry: entry.stat().st_mtime):
+            self.entries[entry.name[:-len('.body')]] = entry.stat().st_size
+        self.total_bytes = sum(self.entries.values())
+        spider.logger.info(f'Coveo cache: {len(self.entries)} entries, {self.total_bytes / 2 ** 20:.1f} MiB in {self.cache_dir}')
+
+    def process_request(self, request, spider):
+        if not is_search_request(request) or request.meta.get('dont_cache'):
+            return None
+        key = search_key(request, volatile_fields=self.ignore_fields)
+        if key not in self.entries:
+            self.stats.inc_value('coveo_cache/miss')
+            return None
+        with open(self.entry_path(key, 'json'), encoding='utf-8') as metadata_file:
+            metadata = json.load(metadata_file)
+        if self.ttl and time.time() - metadata['stored_at'] > self.ttl:
+            self.stats.inc_value('coveo_cache/expired')
+            self.evict(key)
+            return None
+        with open(self.entry_path(key, 'body'), mode='rb') as body_file:
+            body = body_file.read()
+        os.utime(self.entry_path(key, 'body'))  # Most recently used, also across runs
+        self.entries.move_to_end(key)
+        self.stats.inc_value('coveo_cache/hit')
+        response_cls = responsetypes.from_args(headers=metadata['headers'], url=metadata['url'], body=body)
+        return response_cls(url=metadata['url'], status=metadata['status'], headers=metadata['headers'], body=body, request=request, flags=['coveo_cache'])
+
+    def process_response(self, request, response, spider):
+        if 'coveo_cache' in response.flags or response.status != 200 or not is_search_request(request) or request.meta.get('dont_cache'):
+            return response
+        key = search_key(request, volatile_fields=self.ignore_fields)
+        headers = {name.decode('latin-1'): [value.decode('latin-1') for value in values] for name, values in response.headers.items()}
+        headers.pop('Content-Encoding', None)  # The body is stored decompressed
+        with open(self.entry_path(key, 'body'), mode='wb') as body_file:
+            body_file.write(response.body)
+        with open(self.entry_path(key, 'json'), mode='w', encoding='utf-8') as metadata_file:
+            json.dump({'url': response.url, 'status': response.status, 'headers': headers, 'stored_at': time.time()}, metadata_file)
+        self.total_bytes += len(response.body) - self.entries.pop(key, 0)
+        self.entries[key] = len(response.body)
+        self.stats.inc_value('coveo_cache/store')
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self.evict(next(iter(self.entries)))  # Least recently used first
+            self.stats.inc_value('coveo_cache/evicted')
+        return response
+
+    def evict(self, key: str):
+        self.total_bytes -= self.entries.pop(key, 0)
+        for extension in ['body', 'json']:
+            if os.path.exists(self.entry_path(key, extension)):
+                os.remove(self.entry_path(key, extension))
+
+
+# The OS of each curl_cffi impersonate profile: its own headers are those of a desktop browser on it
+IMPERSONATE_OS = {'chrome': 'windows', 'edge': 'windows', 'safari': 'macos'}
+
+
+class AdaptiveRateMiddleware:
+    """Rotates the browser fingerprint per request, adapts the download slot concurrency and retries failed pages with backoff.
+
+    Every request gets a random impersonate profile (ASC_IMPERSONATE_BROWSERS) and freshly generated
+    browserforge headers for the same browser family, desktop device and OS. The slot concurrency follows AIMD: +1 after a full
+    window of search responses under ASC_RATE_TARGET_LATENCY, halved on a throttled/failed response (at most
+    once per ASC_RATE_COOLDOWN seconds), within ASC_RATE_MIN_CONCURRENCY..ASC_RATE_MAX_CONCURRENCY.
+    ASC_RETRY_HTTP_CODES and download errors are retried up to ASC_RETRY_TIMES times after an exponential
+    backoff with jitter (Retry-After is honoured), this replaces Scrapy's RetryMiddleware.
+    """
+
+    def __init__(self, crawler, browsers: list, start_concurrency: int, min_concurrency: int, max_concurrency: int, target_latency: float, cooldown: float,
+                 retry_times: int, retry_http_codes: list, backoff_base: float, backoff_max: float):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.browsers = browsers
+        self.header_generator = header_generator()
+        self.start_concurrency = start_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.retry_times = retry_times
+        self.retry_http_codes = set(retry_http_codes)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.slots = dict()  # download slot key -> {'concurrency', 'successes', 'latency', 'decreased_at'}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if settings.get('ASC_REPLAY_MODE') == 'replay':  # Fixtures are neither throttled nor fingerprinted
+            raise NotConfigured
+        return cls(crawler=crawler, browsers=settings.getlist('ASC_IMPERSONATE_BROWSERS', ['chrome110', 'edge99', 'safari15_5']),
+                   start_concurrency=settings.getint('ASC_RATE_START_CONCURRENCY', 4), min_concurrency=settings.getint('ASC_RATE_MIN_CONCURRENCY', 1),
+                   max_concurrency=settings.getint('ASC_RATE_MAX_CONCURRENCY', 16), target_latency=settings.getfloat('ASC_RATE_TARGET_LATENCY', 2.0),
+                   cooldown=settings.getfloat('ASC_RATE_COOLDOWN', 5.0), retry_times=settings.getint('ASC_RETRY_TIMES', 5),
+                   retry_http_codes=[int(code) for code in settings.getlist('ASC_RETRY_HTTP_CODES', [408, 429, 500, 502, 503, 504, 522, 524])],
+                   backoff_base=settings.getfloat('ASC_RETRY_BACKOFF_BASE', 1.0), backoff_max=settings.getfloat('ASC_RETRY_BACKOFF_MAX', 60.0))
+
+    def process_request(self, request, spider):
+        browser = random.choice(self.browsers)
+        request.meta['impersonate'] = browser
+        browser_family = re.match(r'[a-z]+', browser).group()  # chrome110 -> chrome, safari15_5 -> safari
+        headers = self.header_generator.generate(browser=browser_family, os=IMPERSONATE_OS.get(browser_family, ('windows', 'macos', 'linux')), device='desktop')
+        for name, value in headers.items():
+            request.headers[name] = value
+        return None
+
+    async def process_response(self, request, response, spider):
+        self.adapt(request, failed=response.status in self.retry_http_codes)
+        if response.status not in self.retry_http_codes or request.meta.get('dont_retry'):
+            return response
+        return await self.retry(request, reason=f'{response.status}', spider=spider, retry_after=response.headers.get('Retry-After'), default=response)
+
+    async def process_exception(self, request, exception, spider):
+        if isinstance(exception, IgnoreRequest) or request.meta.get('dont_retry'):
+            return None
+        self.adapt(request, failed=True)
+        return await self.retry(request, reason=exception, spider=spider)
+
+    async def retry(self, request, reason, spider, retry_after=None, default=None):
+        retry_request = get_retry_request(request, spider=spider, reason=reason, max_retry_times=self.retry_times)
+        if retry_request is None:
+            spider.logger.error(f'Lost {request.url} (firstResult={request.meta.get("first_result")}) after {self.retry_times} retries: {reason}')
+            return default
+        delay = self.backoff_delay(retry_times=retry_request.meta['retry_times'], retry_after=retry_after)
+        self.stats.inc_value('adaptive/backoff_seconds', delay)
+        await maybe_deferred_to_future(deferLater(reactor, delay, lambda: None))
+        return retry_request
+
+    def backoff_delay(self, retry_times: int, retry_after=None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:  # HTTP-date form, fall back to the computed backoff
+                pass
+        return random.uniform(0, min(self.backoff_base * 2 ** retry_times, self.backoff_max))  # Full jitter
+
+    def adapt(self, request, failed: bool):
+        key = request.meta.get('download_slot')
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None:
+            return
+        state = self.slots.setdefault(key, {'concurrency': self.start_concurrency, 'successes': 0, 'latency': None, 'decreased_at': 0.0})
+        latency = request.meta.get('download_latency')
+        if latency is not None and is_search_request(request):  # PDF transfer times say nothing about the search endpoint's load
+            state['latency'] = latency if state['latency'] is None else 0.8 * state['latency'] + 0.2 * latency
+
+        if failed or (state['latency'] or 0) > 2 * self.target_latency:
+            state['successes'] = 0
+            if time.monotonic() - state['decreased_at'] > self.cooldown:  # One decrease per burst of failures
+                state['concurrency'] = max(self.min_concurrency, state['concurrency'] // 2)
+                state['decreased_at'] = time.monotonic()
+                self.stats.inc_value('adaptive/decrease')
+        elif (state['latency'] or 0) < self.target_latency:
+            state['successes'] += 1
+            if state['successes'] >= state['concurrency']:  # A full window went through without trouble
+                state['concurrency'] = min(self.max_concurrency, state['concurrency'] + 1)
+                state['successes'] = 0
+                self.stats.inc_value('adaptive/increase')
+        slot.concurrency = state['concurrency']
+        self.stats.set_value('adaptive/concurrency', state['concurrency'])
+        self.stats.max_value('adaptive/max_concurrency', state['concurrency'])
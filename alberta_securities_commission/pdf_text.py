@@ -0,0 +1,48 @@
+# Text and party extraction from the downloaded decision PDFs, run in worker processes by PdfTextPipeline.
+#
+# The decisions open with the style of cause ("Citation: Re Maple Leaf Capital Corp., 2024 ABASC 12")
+# and the parties the proceeding is about ("IN THE MATTER OF ... AND IN THE MATTER OF John Smith ...").
+# Both are read from the first page's text, which is usually more complete than z95xpartiesinvolved.
+
+from alberta_securities_commission.extractors import ALIAS_KEYWORDS, TitleAliasParser
+import re
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+HEADER_CHARS = 5000  # Parties are only searched for in the opening of the decision
+CITATION_PATTERN = re.compile(r'\bRe:?\s+(.+?),\s*\d{4}\s+ABASC\s+\d+', re.IGNORECASE | re.DOTALL)
+MATTER_PATTERN = re.compile(r'AND\s+IN\s+THE\s+MATTER\s+OF\s+(?:THE\s+)?(.+?)(?=AND\s+IN\s+THE\s+MATTER\s+OF|\b(?:Citation|Panel|Date|Decision|Reasons|Ruling)\b|$)',
+                            re.IGNORECASE | re.DOTALL)
+PARTY_SEPARATOR_PATTERN = re.compile(r',\s+(?:and\s+)?(?!(?:Inc|Ltd|Corp|LLC|LLP|L\.P)\b)|\s+and\s+', re.IGNORECASE)
+STATUTE_PATTERN = re.compile(r'\b(?:Act|R\.?S\.?A\.?|S\.?A\.?|c\.\s*S-4)\b')  # "THE SECURITIES ACT, R.S.A. 2000, c. S-4" is not a party
+
+# Only the real alias phrases: company suffixes ('Inc', 'Ltd') are part of a party's name here
+party_alias_parser = TitleAliasParser(alias_keywords=[alias_keyword for alias_keyword in ALIAS_KEYWORDS if alias_keyword not in ['Inc', 'Ltd', 'Inc.', 'Ltd.', '.,', ';']])
+
+
+def extract_parties(text: str) -> tuple:
+    # (parties, aliases) named in the decision's heading, in order of appearance without repeats
+    header = re.sub(r'\s+', ' ', text[:HEADER_CHARS])
+    candidates = [match.group(1) for match in CITATION_PATTERN.finditer(header)]
+    candidates += [match.group(1) for match in MATTER_PATTERN.finditer(header) if not STATUTE_PATTERN.search(match.group(1))]
+    parties, aliases = [], []
+    for candidate in candidates:
+        for party in PARTY_SEPARATOR_PATTERN.split(candidate.strip(' ,;')):
+            name, alias = party_alias_parser.parse_title(party.strip(' ,;'))
+            name, alias = name.strip(' ,;([') or 'N/A', alias.strip(' ,;()[]') or 'N/A'  # "John Smith (also known as Johnny Smith)"
+            if name != 'N/A' and name.lower() not in [known.lower() for known in parties]:
+                parties.append(name)
+            if alias != 'N/A' and alias.lower() not in [known.lower() for known in aliases]:
+                aliases.append(alias)
+    return parties, aliases
+
+
+def extract_pdf_text(path: str) -> dict:
+    # Runs in a worker process: the whole text, plus the parties and aliases found in it
+    reader = pypdf.PdfReader(path)
+    text = '\n'.join(page.extract_text() or '' for page in reader.pages)
+    parties, aliases = extract_parties(text)
+    return {'text': text, 'parties': parties, 'aliases': aliases}
@@ -6,8 +6,452 @@
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from alberta_securities_commission.extensions import stage_timer
+from alberta_securities_commission.items import AlbertaSecuritiesCommissionItem
+from alberta_securities_commission.record_store import RecordStore, content_hash
+from scrapy import signals
+from scrapy.exceptions import DropItem, NotConfigured
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.defer import Deferred, DeferredSemaphore
+from twisted.internet.threads import deferToThread
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+import multiprocessing
+import hashlib
+import asyncio
+import scrapy
+import json
+import csv
+import os
 
 
 class AlbertaSecuritiesCommissionPipeline:
+    """Streams every item to a JSON Lines or CSV file as it arrives, then exports the cleaned data in ASC_EXPORT_FORMATS.
+
+    Incremental runs append to the stream. Other runs write to a .part file that replaces the stream once the
+    run has finished; the rows of a failed or killed run are appended to the previous stream instead, so the
+    merged output never loses records the record store already knows.
+    """
+
+    def __init__(self, stream_format: str, stream_path: str, flush_every: int, export_formats: list, stats=None):
+        self.stream_format = stream_format  # 'jsonl' or 'csv'
+        self.stream_path = stream_path
+        self.flush_every = flush_every
+        self.export_formats = export_formats  # Any of exporters.EXPORT_FORMATS, empty for the stream file only
+        self.partial_path = None  # Stream of a non-incremental run until it has finished
+        self.write_path = None  # stream_path when appending, partial_path otherwise
+        self.stream_file = None
+        self.csv_writer = None
+        self.csv_fieldnames = None  # Set in open_spider, the existing file's header when appending
+        self.items_since_flush = 0
+        self.stats = stats  # Stage timings (RunReportExtension), None outside a crawl
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(stream_format=crawler.settings.get('ASC_STREAM_FORMAT', 'jsonl'), stream_path=crawler.settings.get('ASC_STREAM_PATH'),
+                       flush_every=crawler.settings.getint('ASC_STREAM_FLUSH_EVERY', 100), export_formats=crawler.settings.getlist('ASC_EXPORT_FORMATS', ['parquet']),
+                       stats=crawler.stats)
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)  # The close reason is only sent with the signal
+        return pipeline
+
+    def open_spider(self, spider):
+        if self.stream_format not in ['jsonl', 'csv']:
+            raise ValueError(f'Unsupported ASC_STREAM_FORMAT: {self.stream_format!r}')
+        self.stream_path = self.stream_path or fr"{spider.excel_path}/{spider.name}.{self.stream_format}"
+        self.partial_path = f'{self.stream_path}.part'
+        if os.path.exists(self.partial_path):
+            self.merge_partial_stream()  # Left by a run killed before it closed
+        # Incremental runs append to the existing stream, which makes it the merged output of all runs
+        append = getattr(spider, 'incremental', False) and (os.path.exists(self.stream_path) or os.path.exists(spider.filename))
+        if append and not os.path.exists(self.stream_path):
+            self.seed_stream(filename=spider.filename)  # Output of a run made before streaming existed
+        if self.stream_format == 'csv':
+            self.csv_fieldnames = self.prepare_csv_stream(append=append)
+        self.write_path = self.stream_path if append else self.partial_path
+        self.stream_file = open(self.write_path, mode='a' if append else 'w', encoding='utf-8', newline='')
+        print(f'Streaming items to {self.write_path}' + (' (append)' if append else ''))
+
+    def seed_stream(self, filename: str):
+        import pandas as pd
+        existing_df = pd.read_excel(filename, dtype=str, keep_default_na=False).drop(columns='id', errors='ignore')
+        item_fields = list(AlbertaSecuritiesCommissionItem.fields)  # Same column order as the rows appended after the seed
+        existing_df = existing_df[[field for field in item_fields if field in existing_df] + [column for column in existing_df if column not in item_fields]]
+        if self.stream_format == 'csv':
+            existing_df.to_csv(self.stream_path, index=False)
+        else:
+            existing_df.to_json(self.stream_path, orient='records', lines=True, force_ascii=False)
+        print(f'Seeded {self.stream_path} with {len(existing_df)} rows from {filename}')
+
+    def prepare_csv_stream(self, append: bool) -> list:
+        # Columns of the CSV stream: the item's fields, or those of the file being appended to plus any field the item gained since
+        item_fields = list(AlbertaSecuritiesCommissionItem.fields)
+        if not append or not os.path.exists(self.stream_path) or os.path.getsize(self.stream_path) == 0:
+            return item_fields
+        with open(self.stream_path, encoding='utf-8', newline='') as stream_file:
+            existing_fields = next(csv.reader(stream_file), [])
+        fieldnames = existing_fields + [field for field in item_fields if field not in existing_fields]
+        if fieldnames != existing_fields:  # Rewrite the file with the new columns, its rows leave them empty
+            temp_path = f'{self.stream_path}.tmp'
+            with open(self.stream_path, encoding='utf-8', newline='') as stream_file, open(temp_path, mode='w', encoding='utf-8', newline='') as temp_file:
+                csv_writer = csv.DictWriter(temp_file, fieldnames=fieldnames)
+                csv_writer.writeheader()
+                csv_writer.writerows(csv.DictReader(stream_file))
+            os.replace(temp_path, self.stream_path)
+            print(f'Added the columns {", ".join(fieldnames[len(existing_fields):])} to {self.stream_path}')
+        return fieldnames
+
     def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        if self.stream_format == 'csv':
+            if self.csv_writer is None:
+                self.csv_writer = csv.DictWriter(self.stream_file, fieldnames=self.csv_fieldnames)
+                if self.stream_file.tell() == 0:  # Header only once per file
+                    self.csv_writer.writeheader()
+            self.csv_writer.writerow(adapter.asdict())
+        else:
+            self.stream_file.write(json.dumps(adapter.asdict(), ensure_ascii=False) + '\n')
+        self.items_since_flush += 1
+        if self.items_since_flush >= self.flush_every:  # Periodic flush keeps a killed run usable
+            self.stream_file.flush()
+            self.items_since_flush = 0
+        return item
+
+    def merge_partial_stream(self):
+        # Appends the rows of an unfinished run to the stream, the export keeps the last row of every record
+        if not os.path.exists(self.stream_path) or os.path.getsize(self.stream_path) == 0:
+            os.replace(self.partial_path, self.stream_path)
+            return
+        with open(self.partial_path, encoding='utf-8', newline='') as partial_file:
+            if self.stream_format == 'csv':
+                fieldnames = self.prepare_csv_stream(append=True)
+                with open(self.stream_path, mode='a', encoding='utf-8', newline='') as stream_file:
+                    csv.DictWriter(stream_file, fieldnames=fieldnames).writerows(row for row in csv.DictReader(partial_file) if None not in row.values())  # Not a row cut short
+            else:
+                with open(self.stream_path, mode='a', encoding='utf-8') as stream_file:
+                    stream_file.writelines(line for line in partial_file if line.endswith('\n'))  # Not a line cut short by a kill
+        os.remove(self.partial_path)
+        print(f'Kept the rows of an unfinished run in {self.stream_path}')
+
+    def close_spider(self, spider):
+        self.stream_file.close()
+
+    def spider_closed(self, spider, reason):
+        if self.write_path == self.partial_path:
+            if reason == 'finished' and os.path.getsize(self.partial_path) > 0:
+                os.replace(self.partial_path, self.stream_path)  # Complete output, replaces the previous run's
+            else:
+                self.merge_partial_stream()
+        if self.export_formats:
+            self.export(base_path=fr"{spider.excel_path}/{spider.name}")
+
+    def read_stream(self):
+        import pandas as pd  # Deferred to the export, crawls in a long-lived runner start without it
+        if self.stream_format == 'csv':
+            return pd.read_csv(self.stream_path, dtype=str, keep_default_na=False)
+        with open(self.stream_path, encoding='utf-8') as stream_file:
+            return pd.DataFrame([json.loads(line) for line in stream_file if line.strip()])
+
+    def export(self, base_path: str):
+        import pandas as pd
+        from alberta_securities_commission.cleaning import df_cleaner
+        from alberta_securities_commission.exporters import export_frame
+        print(f"Converting streamed items into DataFrame, then into {', '.join(self.export_formats)}...")
+        try:
+            with stage_timer(self.stats, 'read_stream'):
+                data_df = self.read_stream()
+        except Exception as e:
+            print('Error while reading the stream file:', e)
+            return
+        if data_df.empty:
+            print('Stream file is empty.')
+            return
+        # Incremental runs append the new copy of a changed record after the old one: keep the last, like the record store
+        record_keys = pd.Series([RecordStore.make_key(row) for row in data_df.to_dict('records')], index=data_df.index)
+        data_df = data_df[~record_keys.duplicated(keep='last')]
+        # Pages arrive concurrently, so restore the newest-first order of the Coveo search
+        data_df = data_df.sort_values(by='date', key=lambda dates: pd.to_datetime(dates, errors='coerce'), ascending=False, na_position='last', kind='stable')
+        with stage_timer(self.stats, 'df_cleaner'):
+            data_df = df_cleaner(data_frame=data_df)  # Apply the function to all columns for Cleaning
+        data_df.insert(loc=0, column='id', value=range(1, len(data_df) + 1))  # Add 'id' column at position 1
+        for export_format in self.export_formats:
+            try:
+                with stage_timer(self.stats, f"export_{export_format.replace('.', '_')}"):
+                    path = export_frame(data_frame=data_df, base_path=base_path, export_format=export_format)
+                print(f"{export_format} file Successfully created: {path}")
+            except Exception as e:
+                print(f'Error while Generating {export_format} file:', e)
+
+
+class PdfDownloadPipeline:
+    """Downloads the decision PDFs through Scrapy's engine and stores them under their SHA-256 (ASC_PDF_DOWNLOAD).
+
+    A manifest maps every pdf_url to its stored file with the ETag/Last-Modified it was served with,
+    so re-runs send conditional requests and files already stored (also under another URL) are kept once.
+    Files are written to a temporary name and renamed when complete, and every completed file is appended
+    to the manifest's journal at once, so an interrupted run resumes from the last completed file.
+    """
+
+    def __init__(self, crawler, store_path: str, concurrency_per_host: int):
+        self.crawler = crawler
+        self.store_path = store_path
+        self.concurrency_per_host = concurrency_per_host
+        self.manifest_path = None
+        self.journal_path = None
+        self.journal_file = None
+        self.manifest = dict()
+        self.semaphores = dict()  # Host -> DeferredSemaphore, leaves downloader slots free for the search pages
+        self.downloads = dict()  # pdf_url -> Deferred fired once its download is done, for this run
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ASC_PDF_DOWNLOAD'):
+            raise NotConfigured
+        return cls(crawler=crawler, store_path=crawler.settings.get('ASC_PDF_STORE'), concurrency_per_host=crawler.settings.getint('ASC_PDF_CONCURRENCY_PER_HOST', 4))
+
+    def open_spider(self, spider):
+        self.store_path = self.store_path or fr"{spider.excel_path}/pdfs"
+        os.makedirs(self.store_path, exist_ok=True)
+        self.manifest_path = os.path.join(self.store_path, 'manifest.json')
+        self.journal_path = os.path.join(self.store_path, 'manifest.journal.jsonl')
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as manifest_file:
+                self.manifest = json.load(manifest_file)
+        if os.path.exists(self.journal_path):  # Downloads completed by an interrupted run after its last save
+            with open(self.journal_path, encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        self.manifest.update(json.loads(line))
+                    except ValueError:
+                        pass  # Line cut short by the interruption
+        self.save_manifest()
+        self.journal_file = open(self.journal_path, mode='a', encoding='utf-8')
+        print(f'Downloading PDFs to {self.store_path} ({len(self.manifest)} already in the manifest)')
+
+    def close_spider(self, spider):
+        self.journal_file.close()
+        self.save_manifest()
+
+    def save_manifest(self):
+        # Writes the whole manifest and empties the journal it now includes
+        temp_path = f'{self.manifest_path}.tmp'
+        with open(temp_path, mode='w', encoding='utf-8') as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=1)
+        os.replace(temp_path, self.manifest_path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def content_path(self, sha256: str) -> str:
+        return os.path.join(self.store_path, sha256[:2], f'{sha256}.pdf')
+
+    async def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        pdf_url = adapter.get('pdf_url')
+        if pdf_url in [None, '', 'N/A']:
+            return item
+        if pdf_url in self.downloads:  # The same decision often appears on several pages
+            await maybe_deferred_to_future(self.downloads[pdf_url])
+        else:
+            self.downloads[pdf_url] = Deferred()
+            semaphore = self.semaphores.setdefault(urlparse(pdf_url).netloc, DeferredSemaphore(self.concurrency_per_host))
+            await maybe_deferred_to_future(semaphore.acquire())
+            try:
+                await self.download(pdf_url=pdf_url, spider=spider)
+            except Exception as e:
+                spider.logger.warning(f'Error while downloading {pdf_url}: {e}')
+            finally:
+                semaphore.release()
+                self.downloads[pdf_url].callback(None)  # Wake up the items waiting for the same URL
+        entry = self.manifest.get(pdf_url)
+        adapter['pdf_sha256'] = entry['sha256'] if entry else 'N/A'
+        adapter['pdf_path'] = entry['path'] if entry else 'N/A'
         return item
+
+    async def download(self, pdf_url: str, spider):
+        entry = self.manifest.get(pdf_url)
+        headers = dict()
+        if entry and os.path.exists(entry['path']):  # Conditional request, the server answers 304 if nothing changed
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        request = scrapy.Request(url=pdf_url, headers=headers, dont_filter=True,
+                                 meta={'handle_httpstatus_list': [304]})  # Impersonation is set by AdaptiveRateMiddleware
+        response = await maybe_deferred_to_future(self.crawler.engine.download(request))
+        if response.status == 304:
+            return
+        if response.status != 200:
+            spider.logger.warning(f'PDF {pdf_url} returned HTTP {response.status}')
+            return
+
+        sha256 = hashlib.sha256(response.body).hexdigest()
+        path = self.content_path(sha256)
+        if not os.path.exists(path):  # Same content under another URL is stored once
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f'{path}.part', mode='wb') as pdf_file:
+                pdf_file.write(response.body)
+            os.replace(f'{path}.part', path)
+        self.manifest[pdf_url] = {'sha256': sha256, 'path': path, 'size': len(response.body),
+                                  'etag': response.headers.get('ETag', b'').decode('latin-1'), 'last_modified': response.headers.get('Last-Modified', b'').decode('latin-1')}
+        self.journal_file.write(json.dumps({pdf_url: self.manifest[pdf_url]}) + '\n')
+        self.journal_file.flush()  # One small append per file instead of rewriting the whole manifest
+
+
+class RecordStorePipeline:
+    """Upserts every item into the SQLite record store (ASC_RECORD_STORE) and writes the new/changed ones to a delta file.
+
+    Items are keyed on pdf_url and compared through a hash of their content fields, so every check is one
+    indexed lookup. A repeat of an item already seen in this run (same content, another page) is dropped,
+    a repeat with other content is compared with the record as it was before the run, not with the first copy.
+    The delta file (JSON Lines, rewritten every run) holds one row per new or changed record with a 'change' field.
+    The store is also the spider's record of known documents (spider.record_store, for incremental runs).
+    """
+
+    def __init__(self, stats, store_path: str, delta_path: str, commit_every: int):
+        self.stats = stats
+        self.store_path = store_path
+        self.delta_path = delta_path
+        self.commit_every = commit_every
+        self.record_store = None
+        self.delta_file = None
+        self.run_hashes = dict()  # Record key -> content hash of the last item seen in this run
+        self.pre_run_hashes = dict()  # Record key -> stored content hash before this run (None for a new record)
+        self.run_statuses = dict()  # Record key -> 'new', 'changed' or 'unchanged' against the pre-run record
+        self.delta_repeats = False  # A key was written to the delta more than once, it is deduplicated on close
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ASC_RECORD_STORE_ENABLED', True):
+            raise NotConfigured
+        return cls(stats=crawler.stats, store_path=crawler.settings.get('ASC_RECORD_STORE_PATH'), delta_path=crawler.settings.get('ASC_DELTA_PATH'),
+                   commit_every=crawler.settings.getint('ASC_RECORD_STORE_COMMIT_EVERY', 500))
+
+    def open_spider(self, spider):
+        self.store_path = self.store_path or fr"{spider.excel_path}/{spider.name}_records.sqlite3"
+        self.delta_path = self.delta_path or fr"{spider.excel_path}/{spider.name}_delta.jsonl"
+        self.record_store = RecordStore(path=self.store_path, commit_every=self.commit_every)
+        spider.record_store = self.record_store  # Same connection, the spider's lookups see the uncommitted upserts
+        self.delta_file = open(self.delta_path, mode='w', encoding='utf-8')
+        print(f'Record store {self.store_path} holds {len(self.record_store)} records, delta goes to {self.delta_path}')
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        item_dict = adapter.asdict()
+        key, item_hash = RecordStore.make_key(item_dict), content_hash(item_dict)
+        if self.run_hashes.get(key) == item_hash:
+            self.stats.inc_value('record_store/duplicate')
+            raise DropItem(f'Duplicate of an item already collected in this run: {key}')
+        self.run_hashes[key] = item_hash
+        if key not in self.pre_run_hashes:
+            self.pre_run_hashes[key] = self.record_store.stored_hash(key)
+        self.record_store.upsert(item_dict)  # The store keeps the last copy
+        pre_run_hash = self.pre_run_hashes[key]
+        status = 'new' if pre_run_hash is None else 'unchanged' if pre_run_hash == item_hash else 'changed'
+        previous_status = self.run_statuses.get(key)
+        if previous_status is not None:
+            self.stats.inc_value(f'record_store/{previous_status}', count=-1)  # One count per record, for its last copy
+            self.delta_repeats = self.delta_repeats or previous_status != 'unchanged'
+        self.run_statuses[key] = status
+        self.stats.inc_value(f'record_store/{status}')
+        if status != 'unchanged':
+            self.delta_file.write(json.dumps({**item_dict, 'change': status}, ensure_ascii=False) + '\n')
+        return item
+
+    def deduplicate_delta(self):
+        # Keeps the last row of every record still new or changed, in the order of those rows
+        temp_path = f'{self.delta_path}.tmp'
+        with open(self.delta_path, encoding='utf-8') as delta_file:
+            rows = dict()
+            for line in delta_file:
+                row = json.loads(line)
+                key = RecordStore.make_key(row)
+                rows.pop(key, None)
+                if self.run_statuses.get(key) != 'unchanged':
+                    rows[key] = line
+        with open(temp_path, mode='w', encoding='utf-8') as delta_file:
+            delta_file.writelines(rows.values())
+        os.replace(temp_path, self.delta_path)
+
+    def close_spider(self, spider):
+        self.record_store.close()
+        self.delta_file.close()
+        if self.delta_repeats:
+            self.deduplicate_delta()
+        print(f"Delta: {self.stats.get_value('record_store/new', 0)} new, {self.stats.get_value('record_store/changed', 0)} changed records ({self.delta_path})")
+
+
+class PdfTextPipeline:
+    """Extracts the text and the named parties of the downloaded PDFs in a process pool (ASC_PDF_TEXT, needs ASC_PDF_DOWNLOAD).
+
+    Items queue on a DeferredSemaphore sized to keep every worker busy, the reactor only awaits the
+    workers' futures. Results are cached under the PDF's SHA-256, so unchanged PDFs are parsed once.
+    Sets pdf_text, pdf_parties and pdf_aliases ('N/A' when nothing was found).
+    """
+
+    def __init__(self, cache_path: str, workers: int, max_text_chars: int):
+        self.cache_path = cache_path
+        self.workers = workers
+        self.max_text_chars = max_text_chars  # 0 keeps the whole text
+        self.executor = None
+        self.queue = DeferredSemaphore(workers * 2)  # One job waiting per busy worker
+        self.extractions = dict()  # sha256 -> Deferred fired once its extraction is cached, for this run
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ASC_PDF_TEXT'):
+            raise NotConfigured
+        if not crawler.settings.getbool('ASC_PDF_DOWNLOAD'):
+            raise NotConfigured('ASC_PDF_TEXT needs the downloaded PDFs (ASC_PDF_DOWNLOAD = True)')
+        from alberta_securities_commission import pdf_text  # Deferred: crawls without ASC_PDF_TEXT never load pypdf
+        if pdf_text.pypdf is None:
+            raise NotConfigured('ASC_PDF_TEXT needs the pypdf package')
+        return cls(cache_path=crawler.settings.get('ASC_PDF_TEXT_CACHE'), workers=crawler.settings.getint('ASC_PDF_TEXT_WORKERS') or os.cpu_count() or 1,
+                   max_text_chars=crawler.settings.getint('ASC_PDF_TEXT_MAX_CHARS', 0))
+
+    def open_spider(self, spider):
+        self.cache_path = self.cache_path or fr"{spider.excel_path}/pdf_text"
+        os.makedirs(self.cache_path, exist_ok=True)
+        # Forking the reactor's threads (DNS, deferToThread) into the workers can deadlock them: start them from a clean process instead
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'  # No forkserver on Windows
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(start_method))
+        print(f'Extracting PDF text with {self.workers} worker processes, cached in {self.cache_path}')
+
+    def close_spider(self, spider):
+        return deferToThread(self.executor.shutdown)  # Every item is processed by now, the workers are idle
+
+    def cached_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_path, sha256[:2], f'{sha256}.json')
+
+    async def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        sha256, pdf_path = adapter.get('pdf_sha256'), adapter.get('pdf_path')
+        extraction = None
+        if sha256 not in [None, '', 'N/A']:
+            if sha256 in self.extractions:  # Same PDF under several URLs or pages
+                await maybe_deferred_to_future(self.extractions[sha256])
+            elif not os.path.exists(self.cached_path(sha256)):
+                self.extractions[sha256] = Deferred()
+                await maybe_deferred_to_future(self.queue.acquire())
+                try:
+                    await self.extract(sha256=sha256, pdf_path=pdf_path)
+                except Exception as e:
+                    spider.logger.warning(f'Error while extracting the text of {pdf_path}: {e}')
+                finally:
+                    self.queue.release()
+                    self.extractions[sha256].callback(None)  # Wake up the items waiting for the same PDF
+            if os.path.exists(self.cached_path(sha256)):
+                with open(self.cached_path(sha256), encoding='utf-8') as cache_file:
+                    extraction = json.load(cache_file)
+        text = extraction['text'].strip() if extraction else ''
+        adapter['pdf_text'] = (text[:self.max_text_chars] if self.max_text_chars else text) or 'N/A'
+        adapter['pdf_parties'] = ' | '.join(extraction['parties']) if extraction and extraction['parties'] else 'N/A'
+        adapter['pdf_aliases'] = ' | '.join(extraction['aliases']) if extraction and extraction['aliases'] else 'N/A'
+        return item
+
+    async def extract(self, sha256: str, pdf_path: str):
+        from alberta_securities_commission import pdf_text
+        extraction = await asyncio.wrap_future(self.executor.submit(pdf_text.extract_pdf_text, pdf_path))
+        path = self.cached_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f'{path}.part', mode='w', encoding='utf-8') as cache_file:
+            json.dump(extraction, cache_file, ensure_ascii=False)
+        os.replace(f'{path}.part', path)
@@ -0,0 +1,77 @@
+# Persistent store of every decision collected so far, one row per pdf_url.
+#
+# Each row keeps a hash of the item's content fields, so a later run can tell with a single
+# indexed lookup whether a decision is new, changed (edited title, parties, ...) or unchanged.
+# Incremental crawls stop at the first page holding only unchanged decisions.
+
+from datetime import datetime, timezone
+from typing import Optional
+import hashlib
+import sqlite3
+import json
+
+CONTENT_FIELDS = ['date', 'title', 'alias', 'type', 'parties_involved']  # 'url' is only the result's page position
+
+
+def content_hash(item: dict) -> str:
+    content = json.dumps([item.get(field) for field in CONTENT_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class RecordStore:
+    def __init__(self, path: str, commit_every: int = 500):
+        self.path = path
+        self.commit_every = commit_every
+        self.pending = 0  # Upserts since the last commit
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode=WAL')  # Readers (exports, notebooks) are not blocked during a crawl
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS records (
+            pdf_url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            data TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            last_changed TEXT NOT NULL)''')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS records_content_hash ON records (content_hash)')
+
+    @staticmethod
+    def make_key(item: dict) -> str:
+        pdf_url = item.get('pdf_url', 'N/A')
+        return pdf_url if pdf_url not in ['N/A', '', None] else f'sha256:{content_hash(item)}'  # Results without a PDF are keyed on their content
+
+    def stored_hash(self, key: str) -> Optional[str]:
+        # Content hash of the stored record, None for a key never stored
+        row = self.connection.execute('SELECT content_hash FROM records WHERE pdf_url = ?', (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def upsert(self, item: dict) -> str:
+        # Returns 'new', 'changed' or 'unchanged'
+        key, item_hash = self.make_key(item), content_hash(item)
+        now = datetime.now(timezone.utc).isoformat()
+        stored_hash = self.stored_hash(key)
+        if stored_hash is None:
+            status = 'new'
+            self.connection.execute('INSERT INTO records VALUES (?, ?, ?, ?, ?, ?)', (key, item_hash, json.dumps(item, ensure_ascii=False), now, now, now))
+        elif stored_hash != item_hash:
+            status = 'changed'
+            self.connection.execute('UPDATE records SET content_hash = ?, data = ?, last_seen = ?, last_changed = ? WHERE pdf_url = ?',
+                                    (item_hash, json.dumps(item, ensure_ascii=False), now, now, key))
+        else:
+            status = 'unchanged'
+            self.connection.execute('UPDATE records SET last_seen = ? WHERE pdf_url = ?', (now, key))
+        self.pending += 1
+        if self.pending >= self.commit_every:  # Batched commits, one fsync per batch instead of per item
+            self.commit()
+        return status
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self.pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
@@ -0,0 +1,82 @@
+# Long-lived runner: schedules crawl after crawl in one process, so the reactor, the imports, the
+# browserforge header model and the egress backend (VPN connection) are set up only once.
+#
+# Usage (from the project root):
+#     scrapy crawlloop asc_ca -a incremental=true --every 3600   # commands/crawlloop.py
+#     python -m alberta_securities_commission.runner asc_ca -a incremental=true --every 3600 --times 24
+
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.conf import arglist_to_dict
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
+from twisted.internet import defer
+from twisted.internet.task import deferLater
+from alberta_securities_commission.shared import disconnect_egress_backends
+import argparse
+import logging
+import time
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+@defer.inlineCallbacks
+def schedule_crawls(crawler_process, spider_names: list, spider_kwargs: dict, every: float = 0, times: int = 1, failures: list = None):
+    # One round runs the spiders one after the other (they share the output files and the egress backend),
+    # rounds start every `every` seconds, `times` rounds (0: until the process is stopped). Needs a running reactor.
+    from twisted.internet import reactor
+    failures = [] if failures is None else failures  # Names of the crawls that failed, for the exit code
+    round_number = 0
+    try:
+        while not times or round_number < times:
+            round_started = time.monotonic()
+            for spider_name in spider_names:
+                try:
+                    yield crawler_process.crawl(spider_name, **spider_kwargs)
+                except Exception:
+                    logger.exception(f'Crawl of {spider_name} failed')
+                    failures.append(spider_name)
+            round_number += 1
+            if times and round_number >= times:
+                break
+            yield deferLater(reactor, max(0.0, every - (time.monotonic() - round_started)), lambda: None)
+        yield crawler_process.stop()
+    finally:
+        disconnect_egress_backends()
+        if reactor.running:
+            reactor.stop()
+
+
+def run_crawl_loop(crawler_process, spider_names: list, spider_kwargs: dict, every: float = 0, times: int = 1) -> int:
+    # Runs the reactor until the scheduled rounds are done (or the process is stopped), returns the number of failed crawls
+    if crawler_process.settings.get('TWISTED_REACTOR'):  # The configured reactor, before anything imports the default one
+        install_reactor(crawler_process.settings['TWISTED_REACTOR'], crawler_process.settings.get('ASYNCIO_EVENT_LOOP'))
+    from twisted.internet import reactor
+    failures = []
+    reactor.addSystemEventTrigger('before', 'shutdown', disconnect_egress_backends)  # Also when the runner is interrupted
+    # Crawls are only created once the reactor runs, so one failing in from_crawler cannot stop the reactor before it starts
+    reactor.callWhenRunning(schedule_crawls, crawler_process, spider_names=spider_names, spider_kwargs=spider_kwargs, every=every, times=times, failures=failures)
+    crawler_process.start(stop_after_crawl=False)
+    return len(failures)
+
+
+def long_lived_settings(settings):
+    settings.set('ASC_EGRESS_KEEP_ALIVE', True, priority='cmdline')  # The VPN stays up between crawls
+    return settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run crawls repeatedly in one long-lived process')
+    parser.add_argument('spiders', nargs='+', help='Spider names, crawled one after the other in every round')
+    parser.add_argument('-a', dest='spargs', action='append', default=[], metavar='NAME=VALUE', help='Spider argument (may be repeated)')
+    parser.add_argument('--every', type=float, default=0, help='Seconds between the starts of two rounds')
+    parser.add_argument('--times', type=int, default=1, help='Number of rounds (0: run until stopped)')
+    args = parser.parse_args()
+
+    crawler_process = CrawlerProcess(long_lived_settings(get_project_settings()))
+    if run_crawl_loop(crawler_process, spider_names=args.spiders, spider_kwargs=arglist_to_dict(args.spargs), every=args.every, times=args.times):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,9 @@ BOT_NAME = "alberta_securities_commission"
 SPIDER_MODULES = ["alberta_securities_commission.spiders"]
 NEWSPIDER_MODULE = "alberta_securities_commission.spiders"
 
+# Project commands: `scrapy crawlloop asc_ca --every 3600` runs the crawls in one long-lived process (runner.py)
+COMMANDS_MODULE = "alberta_securities_commission.commands"
+
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 # USER_AGENT = "alberta_securities_commission (+http://www.yourdomain.com)"
 
@@ -19,7 +22,8 @@ NEWSPIDER_MODULE = "alberta_securities_commission.spiders"
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-# CONCURRENT_REQUESTS = 32
+# The per-slot concurrency is tuned by AdaptiveRateMiddleware, this is only the global ceiling
+CONCURRENT_REQUESTS = 32
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
@@ -49,23 +53,115 @@ ROBOTSTXT_OBEY = False
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-# DOWNLOADER_MIDDLEWARES = {
-#    "alberta_securities_commission.middlewares.AlbertaSecuritiesCommissionDownloaderMiddleware": 543,
-# }
+DOWNLOADER_MIDDLEWARES = {
+   "alberta_securities_commission.middlewares.CoveoCacheMiddleware": 40,  # Cache hits need no VPN/proxy
+   "alberta_securities_commission.middlewares.EgressMiddleware": 50,  # Holds requests until the VPN/proxy is up
+   # "alberta_securities_commission.middlewares.AlbertaSecuritiesCommissionDownloaderMiddleware": 543,
+   "alberta_securities_commission.middlewares.AdaptiveRateMiddleware": 550,  # In place of the built-in retry
+   "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
+   "alberta_securities_commission.middlewares.CoveoReplayMiddleware": 580,  # Below HttpCompressionMiddleware, fixtures hold decoded bodies
+}
+
+# Impersonate profiles (scrapy_impersonate / curl_cffi), one is picked for every request with matching browserforge headers
+ASC_IMPERSONATE_BROWSERS = ["chrome110", "edge99", "safari15_5"]
+# Download slot concurrency: starts at START, +1 per window of responses faster than TARGET_LATENCY seconds,
+# halved on a throttled/failed response or above twice the target latency (at most once per COOLDOWN seconds)
+ASC_RATE_START_CONCURRENCY = 4
+ASC_RATE_MIN_CONCURRENCY = 1
+ASC_RATE_MAX_CONCURRENCY = 16
+ASC_RATE_TARGET_LATENCY = 2.0
+ASC_RATE_COOLDOWN = 5.0
+# Throttled/failed requests are retried after a random backoff of up to min(BASE * 2 ** retry, MAX) seconds (or Retry-After)
+ASC_RETRY_TIMES = 5
+ASC_RETRY_HTTP_CODES = [408, 429, 500, 502, 503, 504, 522, 524]
+ASC_RETRY_BACKOFF_BASE = 1.0
+ASC_RETRY_BACKOFF_MAX = 60.0
+
+# How requests leave this machine: ExpressVpnEgress (evpn), ProxyEgress (ASC_EGRESS_PROXY) or NoopEgress (direct)
+ASC_EGRESS_BACKEND = "alberta_securities_commission.egress.ExpressVpnEgress"
+ASC_VPN_COUNTRY_ID = "181"  # canada country code
+# ASC_EGRESS_PROXY = "http://127.0.0.1:8118"
+# Seconds to wait for the backend to be ready (polled every ASC_EGRESS_POLL_INTERVAL seconds)
+ASC_EGRESS_READY_TIMEOUT = 60
+ASC_EGRESS_POLL_INTERVAL = 0.5
+# Share the backend between the crawls of a long-lived runner and keep it connected (set by runner.py / crawlloop)
+ASC_EGRESS_KEEP_ALIVE = False
+
+# Cache the Coveo search responses on disk, keyed on the normalized POST body (development and reruns)
+ASC_CACHE_ENABLED = False
+ASC_CACHE_DIR = "httpcache/coveo"
+# Seconds before a cached page expires (0: never)
+ASC_CACHE_TTL = 86400
+# Least recently used pages are evicted above this size
+ASC_CACHE_MAX_BYTES = 500 * 2 ** 20
+# Body fields left out of the cache key (default: coveo.VOLATILE_FIELDS)
+# ASC_CACHE_IGNORE_FIELDS = ["actionsHistory", "analytics", "visitorId", "referrer", "isGuestUser", "timezone"]
+
+# Decoder of the Coveo search responses: 'auto' (msgspec, else orjson, else json), 'msgspec', 'orjson' or 'json'
+ASC_JSON_DECODER = "auto"
+
+# Offline fixtures for the Coveo search: None, 'record' or 'replay' (no network, no VPN)
+ASC_REPLAY_MODE = None
+ASC_REPLAY_DIR = "fixtures/coveo"
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
-# EXTENSIONS = {
-#    "scrapy.extensions.telnet.TelnetConsole": None,
-# }
+EXTENSIONS = {
+   # "scrapy.extensions.telnet.TelnetConsole": None,
+   "alberta_securities_commission.extensions.RunReportExtension": 500,
+}
+
+# Run report with the stage timings, page/item/byte counts and peak memory: 'json' or 'prometheus' (node_exporter textfile)
+ASC_REPORT_ENABLED = True
+ASC_REPORT_FORMAT = "json"
+# Report path (default: Excel_Files/asc_ca_report.json or .prom)
+# ASC_REPORT_PATH = None
+# Profile the crawl: None, 'cprofile' (.prof for pstats/snakeviz) or 'pyinstrument' (.html, needs pyinstrument)
+ASC_PROFILE = None
+# ASC_PROFILE_PATH = None
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-# ITEM_PIPELINES = {
-#    "alberta_securities_commission.pipelines.AlbertaSecuritiesCommissionPipeline": 300,
-# }
+ITEM_PIPELINES = {
+   "alberta_securities_commission.pipelines.PdfDownloadPipeline": 200,
+   "alberta_securities_commission.pipelines.PdfTextPipeline": 220,
+   "alberta_securities_commission.pipelines.RecordStorePipeline": 250,
+   "alberta_securities_commission.pipelines.AlbertaSecuritiesCommissionPipeline": 300,
+}
 
-# Enable and configure the AutoThrottle extension (disabled by default)
+# Cross-run record store (SQLite, one row per pdf_url with a content hash), new and changed items go to the delta file
+ASC_RECORD_STORE_ENABLED = True
+# Store and delta paths (default: Excel_Files/asc_ca_records.sqlite3 and Excel_Files/asc_ca_delta.jsonl)
+# ASC_RECORD_STORE_PATH = None
+# ASC_DELTA_PATH = None
+# Commit the store after this many upserts
+ASC_RECORD_STORE_COMMIT_EVERY = 500
+
+# Items are streamed to disk as they arrive: 'jsonl' or 'csv'
+ASC_STREAM_FORMAT = "jsonl"
+# Stream file path (default: Excel_Files/asc_ca.<format>)
+# ASC_STREAM_PATH = None
+# Flush the stream file after this many items
+ASC_STREAM_FLUSH_EVERY = 100
+# Formats exported from the stream file when the spider closes: 'parquet', 'arrow', 'csv.gz', 'xlsx' (Excel is opt-in)
+ASC_EXPORT_FORMATS = ["parquet"]
+
+# Download the decision PDFs into a content-addressed store (default: Excel_Files/pdfs)
+ASC_PDF_DOWNLOAD = False
+# ASC_PDF_STORE = None
+# Concurrent PDF downloads per host, the rest of the slots stay free for the search pages
+ASC_PDF_CONCURRENCY_PER_HOST = 4
+
+# Extract the text and the named parties of the downloaded PDFs in worker processes (needs ASC_PDF_DOWNLOAD and pypdf)
+ASC_PDF_TEXT = False
+# Extractions cache, keyed on the PDF's SHA-256 (default: Excel_Files/pdf_text)
+# ASC_PDF_TEXT_CACHE = None
+# Worker processes (0: one per CPU core)
+ASC_PDF_TEXT_WORKERS = 0
+# Truncate pdf_text to this many characters (0: whole text, Excel cells hold at most 32767)
+ASC_PDF_TEXT_MAX_CHARS = 0
+
+# Enable and configure the AutoThrottle extension (disabled by default, AdaptiveRateMiddleware already adapts the rate)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 # AUTOTHROTTLE_ENABLED = True
 # The initial download delay
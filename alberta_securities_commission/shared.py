@@ -0,0 +1,30 @@
+# Process-wide state shared by every crawl of a long-lived runner (runner.py, scrapy crawlloop).
+#
+# A single `scrapy crawl` builds these once anyway; a runner scheduling crawl after crawl in one
+# process reuses them, so later crawls skip the header model load and the VPN connect.
+
+from functools import lru_cache
+from scrapy.utils.misc import load_object
+import browserforge.headers
+
+egress_backends = dict()  # (ASC_EGRESS_BACKEND, ASC_VPN_COUNTRY_ID, ASC_EGRESS_PROXY) -> connected backend
+
+
+@lru_cache(maxsize=None)
+def header_generator() -> browserforge.headers.HeaderGenerator:
+    return browserforge.headers.HeaderGenerator()  # Loads the browserforge network model once per process
+
+
+def shared_egress_backend(crawler):
+    # Same backend for every crawl with the same egress settings, it stays connected between crawls (ASC_EGRESS_KEEP_ALIVE)
+    backend_path = crawler.settings.get('ASC_EGRESS_BACKEND', 'alberta_securities_commission.egress.NoopEgress')
+    key = (backend_path, crawler.settings.get('ASC_VPN_COUNTRY_ID'), crawler.settings.get('ASC_EGRESS_PROXY'))
+    if key not in egress_backends:
+        egress_backends[key] = load_object(backend_path).from_crawler(crawler)
+    return egress_backends[key]
+
+
+def disconnect_egress_backends():
+    for backend in egress_backends.values():
+        backend.disconnect()
+    egress_backends.clear()
@@ -1,116 +1,22 @@
+from urllib.parse import parse_qsl, quote, urlencode
 from scrapy.cmdline import execute
-from datetime import datetime
-import browserforge.headers
 from typing import Iterable
 from scrapy import Request
-import pandas as pd
-import unicodedata
-import random
+from alberta_securities_commission.coveo import date_range_filter, facet_values, split_date_range, year_partitions
+from alberta_securities_commission.decoding import PageDecoder
+from alberta_securities_commission.extensions import stage_timer
+from alberta_securities_commission.extractors import get_pdf_url, get_title_alias, get_parties_involved, get_date, get_notices_type
+from alberta_securities_commission.items import AlbertaSecuritiesCommissionItem
+from alberta_securities_commission.record_store import RecordStore, content_hash
+from alberta_securities_commission.shared import header_generator
 import scrapy
-import time
-import json
-import evpn
 import os
-import re
-
-
-def remove_punctuation(text):
-    if text == 'N/A':
-        return text
-    return ''.join(char for char in text if not (unicodedata.category(char).startswith('P') and char != '|'))
-
-
-def replace_with_na(text: str) -> str:
-    return re.sub(pattern=r'^[\s_-]+$', repl='N/A', string=text)  # Replace _, __, -, --, --- with N/A
-
-
-# Function to remove Extra Spaces from Text
-def remove_extra_spaces(_text: str) -> str:
-    return ' '.join(_text.split())  # Remove extra spaces
-
-
-def df_cleaner(data_frame) -> pd.DataFrame:
-    columns = data_frame.columns.sort_values()
-    data_frame = data_frame.astype(str)  # Convert all data to string
-    data_frame.drop_duplicates(inplace=True)  # Remove duplicate data from DataFrame
-    # Apply the function to all columns for Cleaning
-    for column in columns:
-        # if 'title' in column or 'parties_involved' in column or 'alias' in column:
-        if any(keyword in column for keyword in ['title', 'parties_involved', 'alias']):
-            # Remove punctuation
-            data_frame[column] = data_frame[column].str.replace('–', '')
-            data_frame[column] = data_frame[column].apply(remove_punctuation)
-        data_frame[column] = data_frame[column].apply(remove_extra_spaces)  # Remove extra spaces
-        data_frame[column] = data_frame[column].apply(remove_diacritics)  # Remove diacritics characters
-    priority_columns = ["url", "title", "date", "type", "pdf_url"]
-    columns_required = priority_columns + [col for col in columns if col not in priority_columns]
-    data_frame = data_frame[columns_required]
-    data_frame.replace(to_replace=r'^\s*$', value=None, regex=True, inplace=True)
-    data_frame.replace('NA', pd.NA, inplace=True)  # After cleaning, replace 'nan' strings back with actual NaN values
-    data_frame.fillna(value='N/A', inplace=True)  # Replace NaN values with "N/A"
-    return data_frame
-
-
-def remove_diacritics(input_str):
-    return ''.join(char for char in unicodedata.normalize('NFD', input_str) if not unicodedata.combining(char))
-
-
-def get_pdf_url(result_dict: dict) -> str:
-    click_uri: str = result_dict.get('clickUri', 'N/A')  # Extract the clickUri
-    pdf_base_url: str = 'https://www.asc.ca'  # Convert the clickUri to the desired format
-    pdf_url: str = click_uri.replace('https://asc-cws-prod-web-cm-staging.azurewebsites.net', pdf_base_url)  # Replace the base URL with the desired base URL
-    return pdf_url if click_uri not in ['', ' ', None] else 'N/A'
-
-
-def get_title_alias(result_dict: dict) -> tuple:
-    titles_list: list = result_dict.get('raw', {}).get('z95xsitecoretitle', ['N/A'])
-    cleaned_titles_list: list = [titles.replace("\n", "").replace("<br>", "") for titles in titles_list]  # Remove newline character '\n' and remove '<br>'
-    alias_keywords = ['formerly known as', 'carrying on business as', 'previously known as', 'now known as',
-                      'also known as', 'operating as', 'formerly', 'known as', 'a.k.a.', 'aka', 'dba', 'Inc', 'Ltd', 'Inc.', 'Ltd.', '.,', ';']
-    title_value_list, alias_value_list = [], []
-    # Regex pattern to remove punctuation
-    for title_index, title in enumerate(cleaned_titles_list):
-        for alias_keyword in alias_keywords:
-            title = ' | '.join(title.split(alias_keyword))
-        splitted_title = title.split('|')
-        _title_value = splitted_title[0].strip() if len(splitted_title) > 1 else ' '.join(splitted_title).strip()
-        _alias_value = ' '.join(splitted_title[1:]).strip('.').strip() if len(splitted_title) > 1 else 'N/A'
-        title_value = _title_value if _title_value not in ['', None, ' .', ' ', '.'] else 'N/A'
-        if title_value not in ['N/A', '']:
-            title_value_list.append(title_value)
-        alias_value = _alias_value if _alias_value not in ['', None, ' .', ' ', '.'] else 'N/A'
-        if alias_value not in ['N/A', '']:
-            alias_value = alias_value.strip('.').strip()
-            alias_value_list.append(alias_value)
-
-    title_value_list = [value for value in title_value_list if value != '']
-    alias_value_list = [value for value in alias_value_list if value != '']
-    title_value_str = ' | '.join(title_value_list).strip() if title_value_list != [] else 'N/A'
-    alias_value_str = ' | '.join(alias_value_list).strip() if alias_value_list != [] else 'N/A'
-    return title_value_str, alias_value_str
-
-
-def get_parties_involved(result_dict: dict) -> str:
-    parties_involved: str = ' | '.join(result_dict.get('raw', {}).get('z95xpartiesinvolved', ['N/A'])).strip()
-    parties_involved = parties_involved if parties_involved not in ['', None] else 'N/A'
-    return parties_involved
-
-
-def get_date(result_dict: dict) -> str:
-    # Assuming sysdate is in milliseconds (as it seems to be a UNIX timestamp in ms)
-    sysdate = result_dict.get('raw', {}).get('sysdate')
-    date = 'N/A'
-    if sysdate not in ['', ' ', None, []]:
-        sysdate_seconds = sysdate / 1000  # Convert milliseconds to seconds (Python's datetime works with seconds)
-        item_date = datetime.fromtimestamp(sysdate_seconds)  # Convert the timestamp to a datetime object
-        date = item_date.strftime("%Y-%m-%d")  # Format the date to "YYYY-MM-DD" similar to the JavaScript output
-    return date
-
-
-def get_notices_type(result_dict: dict) -> str:
-    notices_type_list: str = ' | '.join(result_dict.get('raw', {}).get('z95xnoticesdecisionstype', ['N/A'])).strip()
-    notices_type = notices_type_list if notices_type_list not in ['', None] else 'N/A'
-    return notices_type
+
+
+def build_search_body(data: str, first_result: int, number_of_results: int, **overrides) -> str:
+    search_params: dict = dict(parse_qsl(data, keep_blank_values=True))  # Decode the form-encoded Coveo query
+    search_params.update(firstResult=first_result, numberOfResults=number_of_results, **overrides)  # Each page gets its own window
+    return urlencode(search_params, quote_via=quote)
 
 
 class AscCaSpider(scrapy.Spider):
@@ -118,18 +24,18 @@ class AscCaSpider(scrapy.Spider):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        print('Connecting to VPN (CANADA)')
-        self.api = evpn.ExpressVpnApi()  # Connecting to VPN (CANADA)
-        self.api.connect(country_id='181')  # canada country code
-        time.sleep(10)  # keep some time delay before starting scraping because connecting
-        print('VPN Connected!' if self.api.is_connected else 'VPN Not Connected!')
+        # VPN / proxy egress is handled by EgressMiddleware (ASC_EGRESS_BACKEND in settings.py)
 
-        self.final_data_list = list()
         # Path to store the Excel file can be customized by the user
         self.excel_path = r"../Excel_Files"  # Client can customize their Excel file path here (default: govtsites > govtsites > Excel_Files)
         os.makedirs(self.excel_path, exist_ok=True)  # Create Folder if not exists
         self.filename = fr"{self.excel_path}/{self.name}.xlsx"  # Filename with Scrape Date
 
+        # Incremental mode (-a incremental=true) only collects documents missing from the record store or changed since
+        self.incremental = str(kwargs.get('incremental', '')).lower() in ['1', 'true', 'yes']
+        self.record_store = None  # Opened by RecordStorePipeline, kept up to date by every run
+        self.page_decoder = PageDecoder()  # Replaced in from_crawler by the ASC_JSON_DECODER backend
+
         self.cookies = {
             '_gcl_au': '1.1.1734506661.1729499227',
             '_ga': 'GA1.1.1717590813.1729499227',
@@ -141,72 +47,131 @@ class AscCaSpider(scrapy.Spider):
             '_ga_MP2P11677J': 'GS1.1.1729499227.1.1.1729501235.0.0.0',
         }
 
-        # Headers changes at some interval, hence using HeaderGenerator to generate headers
-        self.headers = browserforge.headers.HeaderGenerator().generate()
-        self.number_of_results = 10  # Results per page
-        self.first_result = 0  # Start from the first
+        # Headers changes at some interval, hence using HeaderGenerator to generate headers (AdaptiveRateMiddleware regenerates them per request)
+        self.headers = header_generator().generate()
+        self.number_of_results = int(kwargs.get('number_of_results', 10))  # Results per page (spider argument: -a number_of_results=100)
 
-        self.data = f'actionsHistory=%5B%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T09%3A00%3A23.762Z%5C%22%22%7D%2C%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T08%3A29%3A47.115Z%5C%22%22%7D%2C%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T08%3A27%3A07.652Z%5C%22%22%7D%5D&referrer=&analytics=%7B%22clientId%22%3A%220b8e43c0-c182-0f40-c2b9-26bbcc7a8920%22%2C%22documentLocation%22%3A%22https%3A%2F%2Fwww.asc.ca%2Fen%2Fenforcement%2Fnotices-decisionand-orders%23sort%3D%2540z95xcreateddate%2520descending%22%2C%22documentReferrer%22%3A%22%22%2C%22pageId%22%3A%22%22%7D&visitorId=0b8e43c0-c182-0f40-c2b9-26bbcc7a8920&isGuestUser=false&aq=NOT%20%40z95xtemplate%3D%3D(ADB6CA4F03EF4F47B9AC9CE2BA53FF97%2CFE5DD82648C6436DB87A7C4210C7413B)&cq=(%40z95xlanguage%3D%3Den)%20(%40z95xlatestversion%3D%3D1)%20(%40source%3D%3D%22Coveo_public_index%20-%20ASC-PROD%22)&searchHub=Notices%20Decisions%20and%20Orders&locale=en&pipeline=noticesdecisionsordersenforcement&maximumAge=900000&firstResult={self.first_result}&numberOfResults=10&excerptLength=200&enableDidYouMean=false&sortCriteria=%40z95xcreateddate%20descending&queryFunctions=%5B%5D&rankingFunctions=%5B%5D&groupBy=%5B%7B%22field%22%3A%22%40z95xnoticesdecisionstype%22%2C%22maximumNumberOfValues%22%3A6%2C%22sortCriteria%22%3A%22occurrences%22%2C%22injectionDepth%22%3A1000%2C%22completeFacetWithStandardValues%22%3Atrue%2C%22allowedValues%22%3A%5B%5D%7D%2C%7B%22field%22%3A%22%40z95xcreateddateyear%22%2C%22maximumNumberOfValues%22%3A6%2C%22sortCriteria%22%3A%22alphaDescending%22%2C%22injectionDepth%22%3A1000%2C%22completeFacetWithStandardValues%22%3Atrue%2C%22allowedValues%22%3A%5B%5D%7D%5D&facetOptions=%7B%7D&categoryFacets=%5B%5D&retrieveFirstSentences=true&timezone=Asia%2FCalcutta&enableQuerySyntax=false&enableDuplicateFiltering=false&enableCollaborativeRating=false&debug=false&allowQueriesWithoutKeywords=true'
+        # Partitioned crawl (-a partition=year or month): one shallow, filtered query per date range instead of deep paging.
+        # Ranges holding more than max_partition_results are split in halves until they fit.
+        self.partition = kwargs.get('partition', '') if not self.incremental else ''  # Incremental runs stop at the newest known page instead
+        self.max_partition_results = int(kwargs.get('max_partition_results', 5000))
+        self.partitioned_count = 0  # Sum of the leaf partitions' totals, checked against the archive total
+        self.archive_count = None
 
-        self.browsers = ["chrome110", "edge99", "safari15_5"]
+        self.data = 'actionsHistory=%5B%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T09%3A00%3A23.762Z%5C%22%22%7D%2C%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T08%3A29%3A47.115Z%5C%22%22%7D%2C%7B%22name%22%3A%22Query%22%2C%22time%22%3A%22%5C%222024-10-21T08%3A27%3A07.652Z%5C%22%22%7D%5D&referrer=&analytics=%7B%22clientId%22%3A%220b8e43c0-c182-0f40-c2b9-26bbcc7a8920%22%2C%22documentLocation%22%3A%22https%3A%2F%2Fwww.asc.ca%2Fen%2Fenforcement%2Fnotices-decisionand-orders%23sort%3D%2540z95xcreateddate%2520descending%22%2C%22documentReferrer%22%3A%22%22%2C%22pageId%22%3A%22%22%7D&visitorId=0b8e43c0-c182-0f40-c2b9-26bbcc7a8920&isGuestUser=false&aq=NOT%20%40z95xtemplate%3D%3D(ADB6CA4F03EF4F47B9AC9CE2BA53FF97%2CFE5DD82648C6436DB87A7C4210C7413B)&cq=(%40z95xlanguage%3D%3Den)%20(%40z95xlatestversion%3D%3D1)%20(%40source%3D%3D%22Coveo_public_index%20-%20ASC-PROD%22)&searchHub=Notices%20Decisions%20and%20Orders&locale=en&pipeline=noticesdecisionsordersenforcement&maximumAge=900000&firstResult=0&numberOfResults=10&excerptLength=200&enableDidYouMean=false&sortCriteria=%40z95xcreateddate%20descending&queryFunctions=%5B%5D&rankingFunctions=%5B%5D&groupBy=%5B%7B%22field%22%3A%22%40z95xnoticesdecisionstype%22%2C%22maximumNumberOfValues%22%3A6%2C%22sortCriteria%22%3A%22occurrences%22%2C%22injectionDepth%22%3A1000%2C%22completeFacetWithStandardValues%22%3Atrue%2C%22allowedValues%22%3A%5B%5D%7D%2C%7B%22field%22%3A%22%40z95xcreateddateyear%22%2C%22maximumNumberOfValues%22%3A6%2C%22sortCriteria%22%3A%22alphaDescending%22%2C%22injectionDepth%22%3A1000%2C%22completeFacetWithStandardValues%22%3Atrue%2C%22allowedValues%22%3A%5B%5D%7D%5D&facetOptions=%7B%7D&categoryFacets=%5B%5D&retrieveFirstSentences=true&timezone=Asia%2FCalcutta&enableQuerySyntax=false&enableDuplicateFiltering=false&enableCollaborativeRating=false&debug=false&allowQueriesWithoutKeywords=true'
 
         self.url = 'https://www.asc.ca/coveo/rest/search/v2?sitecoreItemUri=sitecore%3A%2F%2Fweb%2F%7B4914B9E4-A101-438A-A8DF-C04C42874916%7D%3Flang%3Den%26ver%3D2&siteName=asc'
         self.onsite_page_url = 'https://www.asc.ca/en/enforcement/notices-decisions-and-orders#first={SKIP_COUNT}&sort=%40z95xcreateddate%20descending'
+        self.onsite_listing_url = 'https://www.asc.ca/en/enforcement/notices-decisions-and-orders#sort=%40z95xcreateddate%20descending'  # No position: partitioned results
 
-    def start_requests(self) -> Iterable[Request]:
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.page_decoder = PageDecoder(backend=crawler.settings.get('ASC_JSON_DECODER', 'auto'))
+        return spider
 
-        yield scrapy.Request(url=self.url, cookies=self.cookies, headers=self.headers, method='POST', meta={'impersonate': random.choice(self.browsers)}, callback=self.parse, body=self.data, dont_filter=True)
+    @property
+    def stats(self):
+        crawler = getattr(self, 'crawler', None)  # None when the spider is used outside a crawl (benchmarks)
+        return crawler.stats if crawler else None
+
+    def start_requests(self) -> Iterable[Request]:
+        if self.incremental and self.record_store is None:
+            raise ValueError('incremental=true needs the record store (ASC_RECORD_STORE_ENABLED = True)')
+        if self.partition in ['year', 'month']:
+            # Read the year facet first, without results, then query every year (or month) on its own
+            year_facet = '[{"field":"@z95xcreateddateyear","maximumNumberOfValues":1000,"sortCriteria":"alphaDescending","injectionDepth":1000000,"completeFacetWithStandardValues":true,"allowedValues":[]}]'
+            yield self.search_request(first_result=0, callback=self.parse_partitions, number_of_results=0, groupBy=year_facet)
+        else:
+            yield self.search_request(first_result=0, callback=self.parse)
+
+    def search_request(self, first_result: int, callback, partition: tuple = None, number_of_results: int = None, **overrides) -> Request:
+        if partition is not None:
+            base_aq = dict(parse_qsl(self.data)).get('aq', '')
+            overrides['aq'] = f'({base_aq}) ({date_range_filter(*partition)})'
+        number_of_results = self.number_of_results if number_of_results is None else number_of_results
+        body = build_search_body(data=self.data, first_result=first_result, number_of_results=number_of_results, **overrides)
+        return scrapy.Request(url=self.url, cookies=self.cookies, headers=self.headers, method='POST',
+                              meta={'first_result': first_result, 'partition': partition},
+                              callback=callback, body=body, dont_filter=True)
+
+    def parse_partitions(self, response, **kwargs):
+        with stage_timer(self.stats, 'json_decode'):
+            response_dict = self.page_decoder.decode_dict(response.body)  # The facets are needed here, not only the results
+        self.archive_count = response_dict.get('totalCountFiltered', 0)
+        year_counts = {int(year): count for year, count in facet_values(response_dict, field='@z95xcreateddateyear').items() if str(year).isdigit()}
+        if not year_counts:
+            print('No year facet in the response, falling back to a single sorted crawl')
+            yield self.search_request(first_result=0, callback=self.parse)
+            return
+        # Also query the years between the facet values, an empty partition costs one request
+        print(f'Partitioned crawl of {self.archive_count} results over {len(year_counts)} years')
+        for year in range(min(year_counts), max(year_counts) + 1):
+            by_month = self.partition == 'month' or year_counts.get(year, 0) > self.max_partition_results
+            for partition in year_partitions(year=year, by_month=by_month):
+                yield self.search_request(first_result=0, callback=self.parse, partition=partition)
 
     def parse(self, response, **kwargs):
-        response_dict = json.loads(response.text)
-        total_count = response_dict.get('totalCountFiltered', 0)
-
-        # Process current page data
-        self.process_page_data(response_dict)
-
-        # Pagination logic: Keep requesting until the last page is reached
-        if self.first_result < total_count:
-            # Update 'self.data' to modify `firstResult` for the next page
-            self.first_result += self.number_of_results
-            self.data = self.data.replace(f'&firstResult={self.first_result - self.number_of_results}', f'&firstResult={self.first_result}')
-
-            # Send request for the next page
-            yield scrapy.Request(url=self.url, method='POST', body=self.data, callback=self.parse, headers=self.headers, cookies=self.cookies, dont_filter=True)
-
-    def process_page_data(self, response_dict):
-        # Process each page's results
-        for result_dict in response_dict.get('results', []):
-            data_dict = dict()
-            data_dict['url'] = self.onsite_page_url.replace('first={SKIP_COUNT}', f'first={self.first_result}')
-            data_dict['pdf_url'] = get_pdf_url(result_dict)
-            data_dict['date'] = get_date(result_dict)
-            title_alias_tuple = get_title_alias(result_dict)
-            data_dict['title'] = title_alias_tuple[0]
-            data_dict['alias'] = title_alias_tuple[1]
-            data_dict['type'] = get_notices_type(result_dict)
-            data_dict['parties_involved'] = get_parties_involved(result_dict)
-            self.final_data_list.append(data_dict)
-            # print(data_dict)
+        with stage_timer(self.stats, 'json_decode'):
+            page = self.page_decoder.decode_page(response.body)
+        total_count = page.total_count
+        partition = response.meta.get('partition')
+
+        if partition is not None:
+            start, end = partition
+            if total_count > self.max_partition_results and (end - start).days > 1:
+                # Too deep for one partition: query both halves instead (this page is dropped, the halves cover it)
+                for half in split_date_range(start=start, end=end):
+                    yield self.search_request(first_result=0, callback=self.parse, partition=half)
+                return
+            self.partitioned_count += total_count
+
+        # Process first page data
+        new_count = yield from self.process_page_data(page.results, first_result=response.meta['first_result'], partition=partition)
+
+        if self.incremental:
+            # Results are sorted newest first, so walk page by page until a page holds only known documents
+            next_first_result = response.meta['first_result'] + self.number_of_results
+            if new_count and next_first_result < total_count:
+                yield self.search_request(first_result=next_first_result, callback=self.parse)
+            elif not new_count:
+                print(f'Incremental crawl reached known documents at firstResult={response.meta["first_result"]}')
+            return
+
+        # Pagination logic: the total is known after the first page, so request every remaining page at once
+        for first_result in range(self.number_of_results, total_count, self.number_of_results):
+            yield self.search_request(first_result=first_result, callback=self.parse_page, partition=partition)
+
+    def parse_page(self, response, **kwargs):
+        with stage_timer(self.stats, 'json_decode'):
+            page = self.page_decoder.decode_page(response.body)
+        yield from self.process_page_data(page.results, first_result=response.meta['first_result'], partition=response.meta.get('partition'))
+
+    def process_page_data(self, results: list, first_result: int, partition: tuple = None):
+        # Yield an item for each of the page's results (decoding.CoveoResult), returns the number yielded (incremental runs skip the unchanged ones)
+        new_count = 0
+        for result in results:
+            with stage_timer(self.stats, 'extractors'):
+                data_dict = AlbertaSecuritiesCommissionItem()
+                # first_result of a partition is its offset in the date-filtered query, not a page of the on-site listing
+                data_dict['url'] = self.onsite_page_url.replace('first={SKIP_COUNT}', f'first={first_result}') if partition is None else self.onsite_listing_url
+                data_dict['pdf_url'] = get_pdf_url(result)
+                data_dict['date'] = get_date(result)
+                title_alias_tuple = get_title_alias(result)
+                data_dict['title'] = title_alias_tuple[0]
+                data_dict['alias'] = title_alias_tuple[1]
+                data_dict['type'] = get_notices_type(result)
+                data_dict['parties_involved'] = get_parties_involved(result)
+            if self.incremental and self.record_store.stored_hash(RecordStore.make_key(data_dict)) == content_hash(data_dict):
+                continue  # Already present in the existing output
+            new_count += 1
+            yield data_dict
+        return new_count
 
     def close(self, reason):
         print('closing spider...')
-        print("Converting List of Dictionaries into DataFrame, then into Excel file...")
-        if self.final_data_list:
-            try:
-                print("Creating Native sheet...")
-                data_df = pd.DataFrame(self.final_data_list)
-                data_df = df_cleaner(data_frame=data_df)  # Apply the function to all columns for Cleaning
-                with pd.ExcelWriter(path=self.filename, engine='xlsxwriter') as writer:
-                    data_df.insert(loc=0, column='id', value=range(1, len(data_df) + 1))  # Add 'id' column at position 1
-                    data_df.to_excel(excel_writer=writer, index=False)
-                print("Native Excel file Successfully created.")
-            except Exception as e:
-                print('Error while Generating Native Excel file:', e)
-        else:
-            print('Final-Data-List is empty.')
-        if self.api.is_connected:  # Disconnecting VPN if it's still connected
-            self.api.disconnect()
-            print('VPN Connected!' if self.api.is_connected else 'VPN Disconnected!')
+        if self.partition and self.archive_count is not None and self.partitioned_count != self.archive_count:
+            print(f'Partitions covered {self.partitioned_count} of {self.archive_count} results')  # Documents outside the faceted years
 
 
 if __name__ == '__main__':
@@ -0,0 +1,80 @@
+# Benchmark of the vectorized df_cleaner against the original row-by-row implementation.
+#
+# Usage (from the project root): python -m benchmarks.bench_df_cleaner --rows 100000
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from alberta_securities_commission.cleaning import df_cleaner, remove_punctuation, remove_extra_spaces, remove_diacritics
+
+
+def legacy_df_cleaner(data_frame) -> pd.DataFrame:
+    # The original implementation: three Python-level .apply calls per column
+    columns = data_frame.columns.sort_values()
+    data_frame = data_frame.astype(str)
+    data_frame.drop_duplicates(inplace=True)
+    for column in columns:
+        if any(keyword in column for keyword in ['title', 'parties_involved', 'alias']):
+            data_frame[column] = data_frame[column].str.replace('–', '')
+            data_frame[column] = data_frame[column].apply(remove_punctuation)
+        data_frame[column] = data_frame[column].apply(remove_extra_spaces)
+        data_frame[column] = data_frame[column].apply(remove_diacritics)
+    priority_columns = ["url", "title", "date", "type", "pdf_url"]
+    columns_required = priority_columns + [col for col in columns if col not in priority_columns]
+    data_frame = data_frame[columns_required]
+    data_frame.replace(to_replace=r'^\s*$', value=None, regex=True, inplace=True)
+    data_frame.replace('NA', pd.NA, inplace=True)
+    data_frame.fillna(value='N/A', inplace=True)
+    return data_frame
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    # Rows shaped like process_page_data output, with the repetition and noise seen in the real archive
+    rng = random.Random(seed)
+    names = ['Société Générale', 'Crédit Agricole Inc.', 'Zürich Holdings Ltd.', 'Maple Leaf Capital Corp.', 'Jean-François Bédard',
+             'O\'Brien & Associates', 'Nordic Æther AG', 'Smith, John', 'Émile Côté', 'ACME   Resources  –  Ltd.', 'N/A', '—', ' ', 'NA']
+    types = ['Decision', 'Notice of Hearing', 'Order', 'Settlement Agreement', 'N/A']
+    data_list = []
+    for index in range(rows):
+        name = rng.choice(names)
+        data_list.append({
+            'url': f'https://www.asc.ca/en/enforcement/notices-decisions-and-orders#first={index // 10 * 10}&sort=%40z95xcreateddate%20descending',
+            'pdf_url': f'https://www.asc.ca/-/media/ASC-Documents-part-1/Notices-Decisions-Orders/{index}.pdf',
+            'date': f'20{rng.randint(0, 24):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'title': f'{name} (Re)' if rng.random() < 0.7 else f'{name}, {rng.choice(names)}',
+            'alias': rng.choice(['N/A', 'formerly Alpha Corp.', 'Bêta  Ventures', '|  Gamma ; Delta']),
+            'type': rng.choice(types),
+            'parties_involved': ' | '.join(rng.sample(names, k=rng.randint(1, 3))),
+        })
+    data_list += data_list[:rows // 100]  # A few exact duplicates for drop_duplicates
+    return pd.DataFrame(data_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    data_df = synthetic_frame(rows=args.rows)
+    print(f'Cleaning {len(data_df)} rows x {len(data_df.columns)} columns')
+
+    start = time.perf_counter()
+    legacy_df = legacy_df_cleaner(data_frame=data_df)
+    legacy_seconds = time.perf_counter() - start
+    print(f'legacy df_cleaner:     {legacy_seconds:8.3f} s')
+
+    start = time.perf_counter()
+    vectorized_df = df_cleaner(data_frame=data_df)
+    vectorized_seconds = time.perf_counter() - start
+    print(f'vectorized df_cleaner: {vectorized_seconds:8.3f} s  ({legacy_seconds / vectorized_seconds:.1f}x)')
+
+    pd.testing.assert_frame_equal(vectorized_df, legacy_df)
+    assert vectorized_df.to_csv(index=False).encode() == legacy_df.to_csv(index=False).encode(), 'Output differs from the legacy cleaner'
+    print('Output is byte-identical.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Offline benchmark of the Coveo parsing path: decode -> process_page_data -> stream pipeline -> df_cleaner -> export.
+#
+# Usage (from the project root):
+#     python -m benchmarks.bench_pipeline --sizes 1000 10000 100000 1000000 --page-size 100
+#     python -m benchmarks.bench_pipeline --fixtures fixtures/coveo   # recorded responses instead of synthetic ones
+#     python -m benchmarks.bench_pipeline --decoder json msgspec       # compare the decoding backends
+#
+# Reports items/sec, time per stage and peak memory (tracemalloc peak per stage with --memory, process peak RSS always).
+
+from collections import defaultdict
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from alberta_securities_commission.cleaning import df_cleaner
+from alberta_securities_commission.decoding import DECODER_BACKENDS, PageDecoder
+from alberta_securities_commission.exporters import export_frame
+from alberta_securities_commission.pipelines import AlbertaSecuritiesCommissionPipeline
+from alberta_securities_commission.spiders.asc_ca import AscCaSpider
+from benchmarks.synthetic import synthetic_page
+
+
+class StageTimer:
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.seconds = defaultdict(float)
+        self.peak_bytes = defaultdict(int)
+
+    def run(self, stage: str, function, *args, **kwargs):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.seconds[stage] += time.perf_counter() - start
+        if self.trace_memory:
+            self.peak_bytes[stage] = max(self.peak_bytes[stage], tracemalloc.get_traced_memory()[1])
+        return result
+
+
+def synthetic_bodies(total_count: int, page_size: int):
+    for first_result in range(0, total_count, page_size):
+        yield first_result, json.dumps(synthetic_page(first_result=first_result, number_of_results=page_size, total_count=total_count)).encode('utf-8')
+
+
+def fixture_bodies(fixtures_dir: str):
+    for first_result, filename in enumerate(sorted(os.listdir(fixtures_dir))):
+        with open(os.path.join(fixtures_dir, filename), mode='rb') as fixture_file:
+            yield first_result, fixture_file.read()
+
+
+def run(bodies, work_dir: str, trace_memory: bool, export_formats: list, decoder: str) -> dict:
+    spider = AscCaSpider()
+    spider.page_decoder = PageDecoder(backend=decoder)
+    spider.excel_path = work_dir
+    pipeline = AlbertaSecuritiesCommissionPipeline(stream_format='jsonl', stream_path=os.path.join(work_dir, 'items.jsonl'), flush_every=100, export_formats=[])
+    pipeline.open_spider(spider)
+    timer = StageTimer(trace_memory=trace_memory)
+
+    items_count, pages_count = 0, 0
+    for first_result, body in bodies:  # Building the bodies is not timed
+        page = timer.run(f'decode ({spider.page_decoder.backend})', spider.page_decoder.decode_page, body)
+        items = timer.run('process_page_data', list, spider.process_page_data(page.results, first_result=first_result))
+        for item in items:
+            timer.run('stream pipeline', pipeline.process_item, item, spider)
+        items_count += len(items)
+        pages_count += 1
+    pipeline.close_spider(spider)
+    pipeline.spider_closed(spider, reason='finished')  # Moves the finished stream into place
+
+    data_df = timer.run('read stream', pipeline.read_stream)
+    data_df = timer.run('df_cleaner', df_cleaner, data_frame=data_df)
+    data_df.insert(loc=0, column='id', value=range(1, len(data_df) + 1))
+    for export_format in export_formats:
+        timer.run(f'export {export_format}', export_frame, data_frame=data_df, base_path=os.path.join(work_dir, 'asc_ca'), export_format=export_format)
+    return {'pages': pages_count, 'items': items_count, 'seconds': dict(timer.seconds), 'peak_bytes': dict(timer.peak_bytes)}
+
+
+def report(label: str, result: dict):
+    parse_seconds = sum(seconds for stage, seconds in result['seconds'].items() if stage.startswith('decode') or stage == 'process_page_data')
+    total_seconds = sum(result['seconds'].values())
+    print(f"\n{label}: {result['pages']} pages, {result['items']} items")
+    print(f"  parse throughput: {result['items'] / parse_seconds:12,.0f} items/sec")
+    print(f"  end-to-end:       {result['items'] / total_seconds:12,.0f} items/sec")
+    for stage, seconds in result['seconds'].items():
+        peak = result['peak_bytes'].get(stage)
+        print(f"  {stage:18s} {seconds:9.3f} s" + (f"   peak {peak / 2 ** 20:9.1f} MiB" if peak is not None else ''))
+    print(f"  process peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark of the Coveo parsing path')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--fixtures', help='Directory of recorded Coveo responses (ASC_REPLAY_DIR) to use instead of synthetic archives')
+    parser.add_argument('--memory', action='store_true', help='Trace peak memory per stage (slower)')
+    parser.add_argument('--export', nargs='*', default=['parquet'], help='Export formats to time (exporters.EXPORT_FORMATS)')
+    parser.add_argument('--decoder', nargs='+', default=['auto'], choices=['auto', *DECODER_BACKENDS], help='Decoding backends to run (decoding.PageDecoder)')
+    args = parser.parse_args()
+
+    if args.memory:
+        tracemalloc.start()
+    runs = [(f'fixtures {args.fixtures}', lambda: fixture_bodies(args.fixtures))] if args.fixtures else \
+        [(f'{size:,} results', lambda size=size: synthetic_bodies(total_count=size, page_size=args.page_size)) for size in args.sizes]
+    for label, bodies in runs:
+        for decoder in args.decoder:
+            with tempfile.TemporaryDirectory() as work_dir:
+                report(label, run(bodies=bodies(), work_dir=work_dir, trace_memory=args.memory, export_formats=args.export, decoder=decoder))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Regression check of TitleAliasParser against the original get_title_alias loop.
+#
+# Usage (from the project root):
+#     python -m benchmarks.check_title_alias                  # the checked-in corpus must give the pinned (title, alias)
+#     python -m benchmarks.check_title_alias --fuzz 300000    # also count divergences from the legacy loop on random titles
+#
+# benchmarks/title_alias_corpus.json holds the input titles, the legacy loop's (title, alias) and the expected
+# output of the parser. They are equal except for the entries marked 'glued': a keyword glued onto an
+# overlapping keyword with no separator ('Ltdba', 'dbaka'), where the leftmost-longest match now wins.
+
+import argparse
+import json
+import os
+import random
+import time
+import re
+
+from alberta_securities_commission.extractors import ALIAS_KEYWORDS, title_alias_parser
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'title_alias_corpus.json')
+
+
+def legacy_title_alias(titles_list: list) -> tuple:
+    # The original implementation: one split/join round per keyword, in list order
+    cleaned_titles_list: list = [titles.replace("\n", "").replace("<br>", "") for titles in titles_list]
+    title_value_list, alias_value_list = [], []
+    for title in cleaned_titles_list:
+        for alias_keyword in ALIAS_KEYWORDS:
+            title = ' | '.join(title.split(alias_keyword))
+        splitted_title = title.split('|')
+        _title_value = splitted_title[0].strip() if len(splitted_title) > 1 else ' '.join(splitted_title).strip()
+        _alias_value = ' '.join(splitted_title[1:]).strip('.').strip() if len(splitted_title) > 1 else 'N/A'
+        title_value = _title_value if _title_value not in ['', None, ' .', ' ', '.'] else 'N/A'
+        if title_value not in ['N/A', '']:
+            title_value_list.append(title_value)
+        alias_value = _alias_value if _alias_value not in ['', None, ' .', ' ', '.'] else 'N/A'
+        if alias_value not in ['N/A', '']:
+            alias_value = alias_value.strip('.').strip()
+            alias_value_list.append(alias_value)
+    title_value_list = [value for value in title_value_list if value != '']
+    alias_value_list = [value for value in alias_value_list if value != '']
+    title_value_str = ' | '.join(title_value_list).strip() if title_value_list != [] else 'N/A'
+    alias_value_str = ' | '.join(alias_value_list).strip() if alias_value_list != [] else 'N/A'
+    return title_value_str, alias_value_str
+
+
+def random_titles(rng: random.Random) -> list:
+    # Titles glued together from keywords, keyword fragments, words and separators, without spaces half of the time
+    tokens = ALIAS_KEYWORDS + ['Maple', 'Leaf', 'Capital', 'Corp.', 'John', 'Smith', 'Société', '(Re)', 'a', 'k', 'd', 'b', 'I', 'n', 'c', 'L', 't',
+                               '.', ',', ' ', '\n', '<br>', '|', '(', ')']
+    separator = rng.choice(['', ' '])
+    return [separator.join(rng.choice(tokens) for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(1, 2))]
+
+
+def glued_keywords(titles_list: list) -> bool:
+    # Two keyword occurrences overlapping without one containing the other ('Ltdba': 'Ltd' and 'dba'), the only known cause of divergence
+    for title in titles_list:
+        title = title.replace("\n", "").replace("<br>", "")
+        spans = [(match.start(), match.start() + len(alias_keyword)) for alias_keyword in ALIAS_KEYWORDS for match in re.finditer(f'(?={re.escape(alias_keyword)})', title)]
+        if any(first[0] < second[0] < first[1] < second[1] for first in spans for second in spans):
+            return True
+    return False
+
+
+def check_corpus(corpus: list) -> int:
+    failures = 0
+    for entry in corpus:
+        legacy, expected, actual = tuple(entry['legacy']), tuple(entry['expected']), title_alias_parser.parse(entry['titles'])
+        if legacy_title_alias(entry['titles']) != legacy:
+            print(f"Corpus entry out of date, the legacy loop gives {legacy_title_alias(entry['titles'])!r}: {entry}")
+            failures += 1
+        if (legacy != expected) != entry.get('glued', False) or (entry.get('glued', False) and not glued_keywords(entry['titles'])):
+            print(f'Undocumented divergence from the legacy loop: {entry}')
+            failures += 1
+        if actual != expected:
+            print(f'TitleAliasParser gives {actual!r}, expected {expected!r} for {entry["titles"]!r}')
+            failures += 1
+    return failures
+
+
+def fuzz(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    divergent = []
+    for _ in range(count):
+        titles = random_titles(rng)
+        if title_alias_parser.parse(titles) != legacy_title_alias(titles):
+            divergent.append(titles)
+    return divergent
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regression check of TitleAliasParser against the legacy get_title_alias loop')
+    parser.add_argument('--fuzz', type=int, default=0, help='Number of random titles to compare with the legacy loop')
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding='utf-8') as corpus_file:
+        corpus = json.load(corpus_file)
+    failures = check_corpus(corpus)
+    print(f"Corpus: {len(corpus)} entries, {sum(entry.get('glued', False) for entry in corpus)} documented glued-keyword divergences, {failures} failures")
+
+    if args.fuzz:
+        start = time.perf_counter()
+        divergent = fuzz(count=args.fuzz)
+        unexplained = [titles for titles in divergent if not glued_keywords(titles)]
+        print(f'Fuzz: {len(divergent)} of {args.fuzz:,} random titles differ from the legacy loop, {len(unexplained)} without glued keywords '
+              f'({time.perf_counter() - start:.1f} s)')
+        for titles in unexplained[:10]:
+            print(f'  {titles!r}: legacy {legacy_title_alias(titles)!r}, parser {title_alias_parser.parse(titles)!r}')
+        failures += len(unexplained)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
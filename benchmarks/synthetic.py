@@ -0,0 +1,81 @@
+# Synthetic Coveo search responses shaped like the asc.ca notices/decisions archive.
+#
+# Usage (from the project root), writing replay fixtures for the spider's own requests:
+#     python -m benchmarks.synthetic --results 5000 --page-size 10 --out fixtures/coveo
+#     scrapy crawl asc_ca -a number_of_results=10 -s ASC_REPLAY_MODE=replay
+
+import argparse
+import json
+import os
+import random
+
+COMPANIES = ['Maple Leaf Capital Corp.', 'Société Générale Inc.', 'Zürich Holdings Ltd.', 'Northern Lights Energy Inc', 'Bow River Ventures Ltd',
+             'Jean-François Bédard', 'John Smith', 'Émile Côté', 'Prairie Gold Mining Corp.', 'Chinook Digital Assets Inc.']
+ALIASES = ['formerly known as', 'also known as', 'carrying on business as', 'a.k.a.', 'dba', 'operating as']
+TYPES = ['Decision', 'Notice of Hearing', 'Order', 'Settlement Agreement', 'Temporary Cease Trade Order', 'Notice of Withdrawal']
+NEWEST_SYSDATE = 1729468800000  # 2024-10-21, in milliseconds like Coveo's sysdate
+
+
+def synthetic_result(index: int, rng: random.Random) -> dict:
+    company = rng.choice(COMPANIES)
+    title = f'{company} (Re)' if rng.random() < 0.6 else f'{company} {rng.choice(ALIASES)} {rng.choice(COMPANIES)}'
+    parties = rng.sample(COMPANIES, k=rng.randint(1, 3))
+    click_uri = f'https://asc-cws-prod-web-cm-staging.azurewebsites.net/-/media/ASC-Documents-part-1/Notices-Decisions-Orders/{index}.pdf'
+    return {
+        'title': title,
+        'uri': click_uri,
+        'clickUri': click_uri,
+        'excerpt': ' '.join(rng.choice(COMPANIES) for _ in range(12))[:200],
+        'firstSentences': None,
+        'summary': None,
+        'highlights': [],
+        'titleHighlights': [{'length': 5, 'offset': 0}],
+        'raw': {
+            'z95xsitecoretitle': [title],
+            'z95xpartiesinvolved': parties,
+            'z95xnoticesdecisionstype': [rng.choice(TYPES)],
+            'sysdate': NEWEST_SYSDATE - index * 3_600_000,  # Newest first, like the @z95xcreateddate descending sort
+            'z95xcreateddateyear': 2024 - index // 2000,
+            'z95xlanguage': 'en',
+            'sysuri': click_uri,
+        },
+    }
+
+
+def synthetic_page(first_result: int, number_of_results: int, total_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed * 1_000_003 + first_result)  # Same page for the same window, whatever the run
+    results = [synthetic_result(index=index, rng=rng) for index in range(first_result, min(first_result + number_of_results, total_count))]
+    group_by = [{'field': 'z95xcreateddateyear', 'values': [{'value': str(2024 - year), 'numberOfResults': 2000} for year in range(6)]},
+                {'field': 'z95xnoticesdecisionstype', 'values': [{'value': notice_type, 'numberOfResults': total_count // len(TYPES)} for notice_type in TYPES]}]
+    return {'totalCount': total_count, 'totalCountFiltered': total_count, 'duration': 42, 'results': results, 'groupByResults': group_by}
+
+
+def write_fixtures(out_dir: str, total_count: int, number_of_results: int, seed: int = 0) -> int:
+    # Fixtures are keyed like CoveoReplayMiddleware keys the spider's requests, so a replay crawl finds every page
+    from alberta_securities_commission.coveo import search_key
+    from alberta_securities_commission.spiders.asc_ca import AscCaSpider
+    spider = AscCaSpider(number_of_results=number_of_results)
+    os.makedirs(out_dir, exist_ok=True)
+    pages = 0
+    for first_result in range(0, max(total_count, 1), number_of_results):
+        request = spider.search_request(first_result=first_result, callback=spider.parse)
+        page = synthetic_page(first_result=first_result, number_of_results=number_of_results, total_count=total_count, seed=seed)
+        with open(os.path.join(out_dir, f'{search_key(request)}.json'), mode='w', encoding='utf-8') as fixture_file:
+            json.dump(page, fixture_file)
+        pages += 1
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic Coveo fixtures for ASC_REPLAY_MODE=replay')
+    parser.add_argument('--results', type=int, default=5000)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--out', default='fixtures/coveo')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    pages = write_fixtures(out_dir=args.out, total_count=args.results, number_of_results=args.page_size, seed=args.seed)
+    print(f'Wrote {pages} pages ({args.results} results) to {args.out}')
+
+
+if __name__ == '__main__':
+    main()